@@ -5,30 +5,87 @@
 """
 
 import argparse
+import re
+import shlex
 import sys
-import subprocess
-import tempfile
-import os
-
-def encode_text_for_adb(text: str) -> str:
+import time
+from typing import Dict, List
+
+from phone_control import AdbClient, CmdResult
+
+# 每个设备复用一个持久的 adb shell 会话，避免逐字符启动 adb 进程
+_clients: Dict[str, AdbClient] = {}
+
+def _shell_client(device: str) -> AdbClient:
+    """获取（或创建）指定设备的持久 adb shell 客户端"""
+    client = _clients.get(device)
+    if client is None:
+        client = _clients[device] = AdbClient(device=device)
+    return client
+
+def _shell_checked(device: str, *shell_args: str) -> CmdResult:
+    """通过持久会话执行 shell 命令，失败时抛出异常"""
+    return _check_result(_shell_client(device).shell(*shell_args))
+
+def _check_result(res: CmdResult) -> CmdResult:
+    """命令返回非零时抛出异常"""
+    if not res.ok:
+        raise RuntimeError(
+            f"Command {res.command} returned non-zero exit status {res.returncode}: "
+            f"{(res.stderr or res.stdout).strip()}"
+        )
+    return res
+
+# am broadcast 的结果行；接收器设置好剪贴板后返回 Activity.RESULT_OK（-1）
+_RE_BROADCAST_RESULT = re.compile(r'Broadcast completed: result=(-?\d+)')
+CLIPBOARD_RESULT_OK = -1
+# 无法得知广播结果时的固定等待
+CLIPBOARD_FALLBACK_WAIT_S = 0.5
+
+def _wait_clipboard_ready(broadcast: CmdResult) -> None:
     """
-    编码文本以适用于ADB输入
-    处理特殊字符和中文
+    等待剪贴板设置完成
+
+    am broadcast 会阻塞到接收器处理完毕并输出结果码：RESULT_OK 时可立即粘贴，
+    其他结果码说明没有接收器设置剪贴板，抛出异常；没有结果行时退回固定等待
     """
-    # 将空格替换为ADB空格编码
-    encoded = text.replace(" ", "%s")
-    # 处理其他特殊字符
-    encoded = (
-        encoded.replace("%", "%25")
-        .replace("\n", "%0A")
-        .replace("\t", "%09")
-        .replace("&", "\\&")
-        .replace("<", "\\<")
-        .replace(">", "\\>")
-        .replace("\"", "\\\"")
-        .replace("'", "\\'")
-    )
-    return encoded
+    match = _RE_BROADCAST_RESULT.search(broadcast.stdout)
+    if match is None:
+        time.sleep(CLIPBOARD_FALLBACK_WAIT_S)
+        return
+    if int(match.group(1)) != CLIPBOARD_RESULT_OK:
+        raise RuntimeError(f"剪贴板未设置（{match.group(0)}），请确认已安装处理 ADB_CLIPBOARD_TEXT 的应用")
+
+# Linux 输入子系统按键码（<linux/input-event-codes.h>），供 sendevent 使用
+LINUX_KEYCODES: Dict[str, int] = {
+    **{key: code for code, key in enumerate("1234567890", start=2)},
+    **{key: code for code, key in enumerate("qwertyuiop", start=16)},
+    **{key: code for code, key in enumerate("asdfghjkl", start=30)},
+    **{key: code for code, key in enumerate("zxcvbnm", start=44)},
+}
+
+EV_SYN, EV_KEY = 0, 1
+
+# 找不到可写键盘节点时 sendevent 脚本的退出码，调用方据此退回 input keyevent
+NO_KEYBOARD_RC = 97
+
+# 在设备端通过 getevent -pl 查找支持字母键（KEY_Q）且可写的输入设备节点，
+# 与 sendevent 放在同一次 shell 调用中，探测不额外增加往返
+_FIND_KEYBOARD_SCRIPT = (
+    'kbd=$(getevent -pl 2>/dev/null | { dev=; while read -r line; do case "$line" in '
+    '"add device "*) dev=${line##* } ;; '
+    '*"KEY_Q "*|*KEY_Q) [ -n "$dev" ] && [ -w "$dev" ] && { echo "$dev"; break; }; dev= ;; '
+    'esac; done; }); '
+    f'[ -n "$kbd" ] || exit {NO_KEYBOARD_RC}'
+)
+
+def _sendevent_script(keys: List[str]) -> str:
+    """将按键序列转换为一条 shell 脚本：先查找键盘节点，再以 sendevent 按下、同步、抬起、同步"""
+    events = []
+    for key in keys:
+        code = LINUX_KEYCODES[key]
+        events += [(EV_KEY, code, 1), (EV_SYN, 0, 0), (EV_KEY, code, 0), (EV_SYN, 0, 0)]
+    return _FIND_KEYBOARD_SCRIPT + "; " + " && ".join(f'sendevent "$kbd" {t} {c} {v}' for t, c, v in events)
 
 def input_method_clipboard(device: str, text: str):
     """
@@ -36,16 +93,14 @@ def input_method_clipboard(device: str, text: str):
     """
     try:
         # 设置剪贴板
-        cmd_clipboard = f'adb -s {device} shell "am broadcast -a ADB_CLIPBOARD_TEXT --es text \'{text}\'"'
-        subprocess.run(cmd_clipboard, shell=True, check=True)
+        # 参数以 argv 传递，设备端 shell 仅需一次引号转义
+        broadcast = _shell_checked(device, "am", "broadcast", "-a", "ADB_CLIPBOARD_TEXT", "--es", "text", shlex.quote(text))
 
         # 等待剪贴板设置完成
-        import time
-        time.sleep(0.5)
+        _wait_clipboard_ready(broadcast)
 
         # 模拟粘贴操作
-        cmd_paste = f'adb -s {device} shell input keyevent KEYCODE_V'
-        subprocess.run(cmd_paste, shell=True, check=True)
+        _shell_checked(device, "input", "keyevent", "KEYCODE_V")
 
         print(f"✅ 通过剪贴板输入成功: {text}")
         return True
@@ -61,9 +116,9 @@ def input_method_unicode(device: str, text: str):
         # 转换为Unicode编码点
         unicode_points = [f"0x{ord(c):04x}" for c in text]
 
-        for point in unicode_points:
-            cmd = f'adb -s {device} shell input unicode {point}'
-            subprocess.run(cmd, shell=True, check=True)
+        # 合并为一次 shell 调用，避免每个字符一次往返
+        script = " && ".join(f"input unicode {point}" for point in unicode_points)
+        _shell_checked(device, script)
 
         print(f"✅ Unicode编码输入成功: {text}")
         return True
@@ -76,9 +131,7 @@ def input_method_text(device: str, text: str):
     方法3: 标准text命令
     """
     try:
-        encoded_text = encode_text_for_adb(text)
-        cmd = f'adb -s {device} shell input text "{encoded_text}"'
-        subprocess.run(cmd, shell=True, check=True)
+        _check_result(_shell_client(device).text(text))
 
         print(f"✅ 标准text输入成功: {text}")
         return True
@@ -97,16 +150,21 @@ def input_method_virtual(device: str, text: str):
             '鱼': ['yu']
         }
 
+        keys = []
         for char, pinyin in pinyin_map.items():
             # 输入拼音
-            for letter in pinyin[0]:
-                keycode = f'KEYCODE_{letter.upper()}'
-                cmd = f'adb -s {device} shell input keyevent {keycode}'
-                subprocess.run(cmd, shell=True, check=True)
+            keys.extend(pinyin[0])
 
             # 选择候选字（通常是数字键1）
-            cmd = f'adb -s {device} shell input keyevent KEYCODE_1'
-            subprocess.run(cmd, shell=True, check=True)
+            keys.append('1')
+
+        # 快路径：一次 shell 调用查找键盘并写入全部原始按键事件，无需启动 input 工具
+        res = _shell_client(device).shell(_sendevent_script(keys))
+        if res.returncode == NO_KEYBOARD_RC:
+            # input keyevent 支持一次发送多个按键，整个序列只需一次调用
+            _shell_checked(device, "input", "keyevent", *(f'KEYCODE_{key.upper()}' for key in keys))
+        else:
+            _check_result(res)
 
         print(f"✅ 虚拟键盘输入成功: {text}")
         return True
@@ -142,16 +200,20 @@ def main():
 
     print(f"🔄 开始尝试输入中文: {args.text}")
 
-    for name, method in methods:
-        print(f"\n🔍 尝试{name}方法...")
-        if method(args.device, args.text):
-            print(f"✅ {name}方法成功！")
-            return 0
-        else:
-            print(f"⚠️ {name}方法失败，尝试下一个...")
-
-    print("❌ 所有方法都失败了")
-    return 1
+    try:
+        for name, method in methods:
+            print(f"\n🔍 尝试{name}方法...")
+            if method(args.device, args.text):
+                print(f"✅ {name}方法成功！")
+                return 0
+            else:
+                print(f"⚠️ {name}方法失败，尝试下一个...")
+
+        print("❌ 所有方法都失败了")
+        return 1
+    finally:
+        for client in _clients.values():
+            client.close()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -1,18 +1,29 @@
 #!/usr/bin/env python3
 
 import argparse
+import contextlib
+import io
 import json
 import os
+import shlex
+import signal
+import socket
+import stat
 import subprocess
 import sys
+import tempfile
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
+# The persistent `adb shell` session and the adb spawn helper live in phone_view.
+from phone_view import AdbShell, _which
+
 COORDINATE_CONVERSION_AVAILABLE = False
 
 # Import coordinate conversion functions from phone_view.py (independent of timeout helpers)
@@ -22,9 +33,52 @@ try:
 except ImportError:
     COORDINATE_CONVERSION_AVAILABLE = False
 
+IN_PROCESS_VIEW_AVAILABLE = False
+
+# Auto-view calls phone_view.describe() directly; set this env var to run it
+# as a `phone_view.py describe` subprocess instead.
+AUTO_VIEW_SUBPROCESS_ENV = "PHONE_CONTROL_AUTO_VIEW_SUBPROCESS"
+
+SCREEN_VIEW_HEADER = "\n--- Screen View ---"
+
+try:
+    from phone_view import describe as _view_describe
+    IN_PROCESS_VIEW_AVAILABLE = True
+except ImportError:
+    IN_PROCESS_VIEW_AVAILABLE = False
+
+
+# Screen geometry per (adb, device), queried once per command. The built-in
+# default used when the query fails is never cached, and the daemon clears the
+# cache before each request since the screen may rotate or be resized between them.
+_screen_info_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+
+def _screen_info(adb: str, device: str) -> Dict[str, Any]:
+    key = (adb, device)
+    info = _screen_info_cache.get(key)
+    if info is None:
+        info = get_accurate_screen_info(adb, device)
+        if info.get("source") != "default":
+            _screen_info_cache[key] = info
+    return info
+
 
 DEFAULT_DEVICE = "127.0.0.1:5555"
 
+# Absolute coordinates beyond this are certainly off-screen and get clamped.
+MAX_PLAUSIBLE_COORD = 16384
+
+# How long a client waits for a daemon reply beyond --timeout and --wait;
+# covers the auto-view minimum and screen-size lookups.
+DAEMON_REPLY_GRACE_S = 30
+
+# How long the daemon waits for a connected client to send its request.
+DAEMON_READ_TIMEOUT_S = 5
+
+# Environment variables the client forwards so a daemon request behaves like
+# a direct run from the client's shell.
+DAEMON_FORWARDED_ENV = (AUTO_VIEW_SUBPROCESS_ENV, "XDG_CACHE_HOME")
 
 KEYCODES: Dict[str, str] = {
     "back": "4",
@@ -52,22 +106,22 @@ APP_PACKAGES: Dict[str, str] = {
     "twitter": "com.twitter.android",
 }
 
+# Case-insensitive view of APP_PACKAGES, so alias resolution is one lookup.
+APP_PACKAGES_CI: Dict[str, str] = {k.casefold(): v for k, v in APP_PACKAGES.items()}
+
+
+def _resolve_package(package_or_alias: str) -> Optional[str]:
+    # Known alias, otherwise anything dotted is taken as a package name.
+    return APP_PACKAGES_CI.get(package_or_alias.casefold()) or (
+        package_or_alias if "." in package_or_alias else None
+    )
+
 
 def _encode_adb_text(text: str) -> str:
     # adb input text treats spaces specially; %s means space.
-    # Also escape characters that have special meaning in the input tool.
-    # This is not perfect for all IMEs, but is a pragmatic default.
-    return (
-        text.replace("%", "%25")
-        .replace(" ", "%s")
-        .replace("\n", "%0A")
-        .replace("\t", "%09")
-        .replace("&", "\\&")
-        .replace("<", "\\<")
-        .replace(">", "\\>")
-        .replace("\"", "\\\"")
-        .replace("'", "\\'")
-    )
+    # `adb shell` joins its argv and the device shell re-parses it, so quote
+    # once for that shell instead of backslash-escaping individual characters.
+    return shlex.quote(text.replace(" ", "%s"))
 
 
 @dataclass
@@ -93,6 +147,8 @@ class AdbClient:
         self.adb = adb
         self.device = device
         self.timeout_s = timeout_s
+        # Long-lived `adb shell` session; its child is spawned on the first shell command.
+        self._session = AdbShell(adb, device, timeout_s)
 
     def _base(self) -> List[str]:
         return [self.adb, "-s", self.device]
@@ -106,6 +162,9 @@ class AdbClient:
                 stderr=subprocess.PIPE,
                 text=True,
                 timeout=self.timeout_s,
+                # Resolved adb path and close_fds=False take CPython's posix_spawn fast path.
+                executable=_which(cmd[0]),
+                close_fds=False,
             )
             return CmdResult(
                 ok=p.returncode == 0,
@@ -115,30 +174,60 @@ class AdbClient:
                 returncode=p.returncode,
             )
         except subprocess.TimeoutExpired as e:
-            stdout = e.stdout or ""
-            stderr = (e.stderr or "") + "\nTIMEOUT"
+            return self._timeout_result(cmd, e.stdout or "", e.stderr or "")
 
-            stderr += (
-                f"\n\nCommand timed out after {self.timeout_s} seconds. "
-                f"Consider increasing timeout with --timeout {self.timeout_s * 2}."
-            )
+    def _timeout_hint(self) -> str:
+        return (
+            f"\n\nCommand timed out after {self.timeout_s} seconds. "
+            f"Consider increasing timeout with --timeout {self.timeout_s * 2}."
+        )
 
-            return CmdResult(
-                ok=False,
-                command=cmd,
-                stdout=stdout,
-                stderr=stderr,
-                returncode=124,
-            )
+    def _timeout_result(self, cmd: List[str], stdout: str, stderr: str) -> CmdResult:
+        stderr += "\nTIMEOUT" + self._timeout_hint()
+
+        return CmdResult(
+            ok=False,
+            command=cmd,
+            stdout=stdout,
+            stderr=stderr,
+            returncode=124,
+        )
+
+    def _shell_exec(self, shell_args: Sequence[str]) -> CmdResult:
+        """
+        Run one command line through the persistent `adb shell` session.
+
+        Arguments are joined with spaces exactly like `adb shell a b c` does, so
+        callers keep the same quoting semantics as the one-shot path. Framing,
+        timeouts and fallbacks are handled by phone_view.AdbShell.
+        """
+        cmd = self._base() + ["shell", *shell_args]
+        res = self._session.exec(" ".join(shell_args), timeout_s=self.timeout_s)
+        stderr = res.stderr
+        if res.returncode == 124 and stderr.endswith("TIMEOUT"):
+            stderr += self._timeout_hint()
+        return CmdResult(
+            ok=res.ok,
+            command=cmd,
+            stdout=res.stdout,
+            stderr=stderr,
+            returncode=res.returncode,
+        )
+
+    def close(self) -> None:
+        """Shut down the persistent `adb shell` session, if one was started."""
+        self._session.close()
 
     def connect(self) -> CmdResult:
+        # A (re)connected device may report a different resolution/rotation.
+        _screen_info_cache.clear()
         return self.run([self.adb, "connect", self.device])
 
     def devices(self) -> CmdResult:
         return self.run([self.adb, "devices"])  # no -s; lists all
 
     def shell(self, *shell_args: str) -> CmdResult:
-        return self.run(self._base() + ["shell", *shell_args])
+        return self._shell_exec(shell_args)
 
     def tap(self, x: int, y: int) -> CmdResult:
         return self.shell("input", "tap", str(x), str(y))
@@ -149,16 +238,17 @@ class AdbClient:
             cmd.append(str(duration_ms))
         return self.shell(*cmd)
 
-    def key(self, key_name_or_code: str) -> CmdResult:
-        code = KEYCODES.get(key_name_or_code.lower(), key_name_or_code)
-        return self.shell("input", "keyevent", str(code))
+    def key(self, *key_names_or_codes: str) -> CmdResult:
+        # `input keyevent` accepts several codes, so a key sequence is one call.
+        codes = [KEYCODES.get(k.lower(), k) for k in key_names_or_codes]
+        return self.shell("input", "keyevent", *codes)
 
     def text(self, text: str) -> CmdResult:
         return self.shell("input", "text", _encode_adb_text(text))
 
     def app_start(self, package_or_alias: str) -> CmdResult:
-        pkg = APP_PACKAGES.get(package_or_alias.lower(), APP_PACKAGES.get(package_or_alias, package_or_alias))
-        if "." not in pkg:
+        pkg = _resolve_package(package_or_alias)
+        if pkg is None:
             return CmdResult(
                 ok=False,
                 command=["app_start", package_or_alias],
@@ -178,8 +268,8 @@ class AdbClient:
         )
 
     def app_stop(self, package_or_alias: str) -> CmdResult:
-        pkg = APP_PACKAGES.get(package_or_alias.lower(), APP_PACKAGES.get(package_or_alias, package_or_alias))
-        if "." not in pkg:
+        pkg = _resolve_package(package_or_alias)
+        if pkg is None:
             return CmdResult(
                 ok=False,
                 command=["app_stop", package_or_alias],
@@ -195,7 +285,7 @@ def _get_phone_view_script_path() -> str:
     script_dir = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(script_dir, "phone_view.py")
 
-def _auto_view_screen(adb: str, device: str, timeout: int, as_json: bool = False) -> Optional[Any]:
+def _auto_view_screen(adb: str, device: str, timeout: int, as_json: bool = False, pre_wait: float = 0) -> Optional[Any]:
     """
     Automatically capture and describe screen after operation.
 
@@ -204,11 +294,80 @@ def _auto_view_screen(adb: str, device: str, timeout: int, as_json: bool = False
         device: Device identifier
         timeout: Timeout in seconds
         as_json: Whether to output JSON format
+        pre_wait: Seconds to wait before capturing the screen
 
     Returns:
         - text mode: screen description (str) if successful, otherwise None
         - json mode: a dict under key `auto_view` to embed into the main JSON output
     """
+    if IN_PROCESS_VIEW_AVAILABLE and not os.environ.get(AUTO_VIEW_SUBPROCESS_ENV):
+        return _auto_view_in_process(adb, device, timeout, as_json, pre_wait)
+    return _auto_view_subprocess(adb, device, timeout, as_json, pre_wait)
+
+
+def _auto_view_failure(error_output: str, timeout: int, as_json: bool, returncode: Optional[int] = None) -> Optional[Any]:
+    """Report an auto-view failure in the same shape for both execution paths."""
+    timeout_error = "timeout" in error_output.lower() or "timed out" in error_output.lower()
+
+    if as_json:
+        return {
+            "ok": False,
+            "error": error_output,
+            "returncode": returncode,
+            "timeout_error": timeout_error,
+            "suggested_timeout": (timeout * 2) if timeout_error else None,
+        }
+    else:
+        if timeout_error:
+            print(
+                f"Auto-view failed: {error_output}. Consider increasing timeout with --timeout {timeout * 2}.",
+                file=sys.stderr,
+            )
+        else:
+            print(f"Auto-view failed: {error_output}", file=sys.stderr)
+    return None
+
+
+def _auto_view_in_process(adb: str, device: str, timeout: int, as_json: bool, pre_wait: float) -> Optional[Any]:
+    """Run phone_view.describe() in this interpreter, skipping a Python startup."""
+    if pre_wait > 0:
+        time.sleep(pre_wait)
+
+    # Progress messages from phone_view are kept out of our stderr unless the
+    # view fails, matching what the subprocess path shows.
+    view_stderr = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(view_stderr):
+            view = _view_describe(adb, device, timeout, as_json=as_json)
+    except Exception as e:
+        error_output = str(e).strip() or view_stderr.getvalue().strip() or type(e).__name__
+        return _auto_view_failure(error_output, timeout, as_json, returncode=1)
+
+    if as_json:
+        return {
+            "ok": True,
+            "description": view.get("description", ""),
+            "raw": view,
+        }
+    return view.strip()
+
+
+def _stdout_fileno() -> Optional[int]:
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # io.UnsupportedOperation (e.g. StringIO under the daemon) is an OSError.
+        return None
+
+
+def _auto_view_subprocess(adb: str, device: str, timeout: int, as_json: bool, pre_wait: float) -> Optional[Any]:
+    """
+    Run `phone_view.py describe` as a child; the child performs pre_wait itself.
+
+    In text mode the description is streamed to stdout and "" is returned, so
+    the caller must not print it again. The screen-view header is printed with
+    the first output, so a view that fails without output leaves no header.
+    """
     phone_view_path = _get_phone_view_script_path()
 
     try:
@@ -221,17 +380,53 @@ def _auto_view_screen(adb: str, device: str, timeout: int, as_json: bool = False
             "--adb", adb,
             "--device", device,
             "--timeout", str(timeout),
+            "--wait", str(pre_wait),
         ])
 
         # Add subcommand
         cmd.append("describe")
 
+        # Text mode relays the child's stdout as it arrives instead of
+        # buffering the whole description; needs a real fd (not under the daemon).
+        if not as_json and _stdout_fileno() is not None:
+            view_timeout = timeout + pre_wait + 10
+            with tempfile.TemporaryFile() as err_file:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err_file)
+                timed_out = threading.Event()
+
+                def _kill() -> None:
+                    timed_out.set()
+                    proc.kill()
+
+                timer = threading.Timer(view_timeout, _kill)
+                timer.start()
+                header_printed = False
+                try:
+                    for chunk in iter(lambda: proc.stdout.read1(65536), b""):
+                        if not header_printed:
+                            print(SCREEN_VIEW_HEADER, flush=True)
+                            header_printed = True
+                        sys.stdout.buffer.write(chunk)
+                        sys.stdout.buffer.flush()
+                    proc.wait()
+                finally:
+                    timer.cancel()
+                    proc.stdout.close()
+                if timed_out.is_set():
+                    raise subprocess.TimeoutExpired(cmd, view_timeout)
+                if proc.returncode == 0:
+                    return ""  # already printed
+                err_file.seek(0)
+                stderr_text = err_file.read().decode("utf-8", errors="replace")
+            error_output = stderr_text.strip() or f"returncode={proc.returncode}"
+            return _auto_view_failure(error_output, timeout, as_json, returncode=proc.returncode)
+
         result = subprocess.run(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
-            timeout=timeout + 10  # Give extra time for AI processing
+            timeout=timeout + pre_wait + 10  # Give extra time for AI processing
         )
 
         if result.returncode == 0:
@@ -255,25 +450,7 @@ def _auto_view_screen(adb: str, device: str, timeout: int, as_json: bool = False
             returncode = result.returncode
 
             error_output = stderr_text or (result.stdout or "").strip() or f"returncode={returncode}"
-            timeout_error = "timeout" in error_output.lower() or "timed out" in error_output.lower()
-
-            if as_json:
-                return {
-                    "ok": False,
-                    "error": error_output,
-                    "returncode": returncode,
-                    "timeout_error": timeout_error,
-                    "suggested_timeout": (timeout * 2) if timeout_error else None,
-                }
-            else:
-                if timeout_error:
-                    print(
-                        f"Auto-view failed: {error_output}. Consider increasing timeout with --timeout {timeout * 2}.",
-                        file=sys.stderr,
-                    )
-                else:
-                    print(f"Auto-view failed: {error_output}", file=sys.stderr)
-            return None
+            return _auto_view_failure(error_output, timeout, as_json, returncode=returncode)
 
     except subprocess.TimeoutExpired as e:
         error_msg = f"Auto-view timeout after {timeout} seconds"
@@ -315,7 +492,8 @@ def _print_result(result: CmdResult, as_json: bool, auto_view_desc: Optional[Any
     Args:
         result: Command execution result
         as_json: Whether to output JSON format
-        auto_view_desc: Optional screen description from auto-view
+        auto_view_desc: Optional screen description from auto-view, embedded in
+            JSON output (text mode prints it in _execute_with_auto_view)
     """
     if as_json:
         output_data = result.to_dict()
@@ -338,10 +516,194 @@ def _print_result(result: CmdResult, as_json: bool, auto_view_desc: Optional[Any
             print(result.stderr.rstrip(), file=sys.stderr)
         sys.exit(result.returncode or 1)
 
-    # Print auto-view description if available
-    if auto_view_desc:
-        print(f"\n--- Screen View ---")
-        print(auto_view_desc)
+
+def _daemon_socket_dir(create: bool = False) -> str:
+    """
+    Directory for daemon sockets that other local users cannot write to.
+
+    $XDG_RUNTIME_DIR when set, otherwise a per-user 0700 directory under the
+    temp dir. Raises OSError if that directory is missing, or is not a private
+    directory of ours (someone else may have planted it).
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return runtime_dir
+    path = os.path.join(tempfile.gettempdir(), f"phone_control-{os.getuid()}")
+    if create:
+        with contextlib.suppress(FileExistsError):
+            os.mkdir(path, 0o700)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a private directory owned by this user")
+    return path
+
+
+def _daemon_socket_path(device: str, create_dir: bool = False) -> str:
+    safe_device = device.replace(os.sep, "_")
+    return os.path.join(_daemon_socket_dir(create_dir), f"phone_control-{safe_device}.sock")
+
+
+def _forward_to_daemon(argv: Sequence[str], device: str, timeout_s: float) -> Optional[int]:
+    """
+    Send the command line to a running daemon for this device.
+
+    Returns the command's exit code, or None if no daemon is reachable and the
+    caller should talk to adb directly.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        path = _daemon_socket_path(device)
+    except OSError:
+        return None  # no private socket directory, so no daemon of ours
+    if not os.path.exists(path):
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout_s)
+        try:
+            conn.connect(path)
+        except OSError:
+            return None  # stale socket file
+
+        try:
+            envelope = {
+                "argv": list(argv),
+                "cwd": os.getcwd(),
+                "env": {name: os.environ.get(name) for name in DAEMON_FORWARDED_ENV},
+            }
+            conn.sendall(json.dumps(envelope, ensure_ascii=False).encode("utf-8") + b"\n")
+            with conn.makefile("rb") as reader:
+                line = reader.readline()
+            reply = json.loads(line)
+        except socket.timeout:
+            print(
+                f"Daemon did not reply within {timeout_s:g} seconds. "
+                "Restart the daemon or retry with --no-daemon.",
+                file=sys.stderr,
+            )
+            return 124
+        except (OSError, ValueError) as e:
+            # The command may already have run, so do not retry it directly.
+            print(f"Daemon request failed: {e}", file=sys.stderr)
+            return 1
+
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    return reply.get("returncode", 1)
+
+
+@contextlib.contextmanager
+def _client_context(envelope: Dict[str, Any]):
+    """Run a daemon request in the client's working directory and environment."""
+    saved_cwd = os.getcwd()
+    saved_env = {name: os.environ.get(name) for name in DAEMON_FORWARDED_ENV}
+
+    def apply(cwd: Optional[str], env: Dict[str, Optional[str]]) -> None:
+        if cwd:
+            os.chdir(cwd)
+        for name in DAEMON_FORWARDED_ENV:
+            value = env.get(name)
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    try:
+        apply(envelope.get("cwd"), envelope.get("env") or {})
+        yield
+    finally:
+        apply(saved_cwd, saved_env)
+
+
+def _handle_daemon_request(conn: socket.socket, adb: AdbClient) -> None:
+    # Never let a silent client block the single-threaded daemon.
+    conn.settimeout(DAEMON_READ_TIMEOUT_S)
+    try:
+        with conn.makefile("rb") as reader:
+            line = reader.readline()
+    except OSError:
+        return  # timed out (socket.timeout is an OSError) or connection reset
+    if not line:
+        return  # liveness probe or client gone
+
+    _screen_info_cache.clear()
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            envelope = json.loads(line)
+            args = build_parser().parse_args(envelope["argv"])
+            if args.cmd == "daemon":
+                print("Cannot start a daemon from inside the daemon.", file=sys.stderr)
+                returncode = 2
+            elif args.device != adb.device:
+                print(f"This daemon serves {adb.device}, not {args.device}.", file=sys.stderr)
+                returncode = 2
+            elif args.adb != adb.adb:
+                print(f"This daemon runs {adb.adb}, not {args.adb}; use --no-daemon.", file=sys.stderr)
+                returncode = 2
+            else:
+                adb.timeout_s = args.timeout
+                with _client_context(envelope):
+                    returncode = _execute(args, adb)
+        except SystemExit as e:
+            # argparse errors and _print_result failures exit with a code.
+            returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            print(f"Daemon error: {e}", file=sys.stderr)
+            returncode = 1
+
+    reply = {"returncode": returncode, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+    try:
+        conn.sendall(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+    except OSError:
+        pass  # client went away; nothing to report to
+
+
+def _serve_daemon(args: argparse.Namespace) -> int:
+    """Serve JSON command envelopes for one device until interrupted."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: daemon mode requires unix domain sockets.", file=sys.stderr)
+        return 2
+
+    try:
+        path = _daemon_socket_path(args.device, create_dir=True)
+    except OSError as e:
+        print(f"Error: cannot use daemon socket directory: {e}", file=sys.stderr)
+        return 1
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except OSError:
+                os.unlink(path)  # left behind by a daemon that died
+            else:
+                print(f"Error: a daemon is already listening on {path}", file=sys.stderr)
+                return 1
+
+    adb = AdbClient(adb=args.adb, device=args.device, timeout_s=args.timeout)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Let `kill` stop the daemon through the same cleanup as Ctrl-C.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.bind(path)
+        server.listen()
+        print(f"phone_control daemon for {args.device} listening on {path}", file=sys.stderr)
+        # One request at a time: commands share the adb session and stdout capture.
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                _handle_daemon_request(conn, adb)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        server.close()
+        adb.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -366,18 +728,29 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_false",
         help="Disable automatic screen capture/description after operations",
     )
-    p.set_defaults(auto_view=True)
+    # Handlers read these unconditionally; `relative` is overridden by the
+    # tap/swipe subparsers that define --relative.
+    p.set_defaults(auto_view=True, relative=False)
     p.add_argument("--wait", type=float, default=1.5, help="Wait time in seconds before auto-view (default: 1.5)")
+    p.add_argument(
+        "--no-daemon",
+        dest="use_daemon",
+        action="store_false",
+        help="Do not forward to a running `daemon` for this device; always call adb directly",
+    )
 
     sub = p.add_subparsers(dest="cmd", required=True)
 
-    sub.add_parser("connect", help="adb connect <device>")
-    sub.add_parser("devices", help="List devices")
+    connect_p = sub.add_parser("connect", help="adb connect <device>")
+    connect_p.set_defaults(func=_handle_connect)
+    devices_p = sub.add_parser("devices", help="List devices")
+    devices_p.set_defaults(func=_handle_devices)
 
     tap_p = sub.add_parser("tap", help="Tap at coordinates")
     tap_p.add_argument("x", type=int, help="X coordinate (absolute pixels or relative if --relative)")
     tap_p.add_argument("y", type=int, help="Y coordinate (absolute pixels or relative if --relative)")
     tap_p.add_argument("--relative", action="store_true", help="Treat coordinates as relative (0-999) instead of absolute pixels")
+    tap_p.set_defaults(func=_handle_tap)
 
     swipe_p = sub.add_parser("swipe", help="Swipe from (x1,y1) to (x2,y2)")
     swipe_p.add_argument("x1", type=int, help="Start X coordinate (absolute pixels or relative if --relative)")
@@ -386,163 +759,206 @@ def build_parser() -> argparse.ArgumentParser:
     swipe_p.add_argument("y2", type=int, help="End Y coordinate (absolute pixels or relative if --relative)")
     swipe_p.add_argument("--duration", type=int, default=None, help="Duration in ms")
     swipe_p.add_argument("--relative", action="store_true", help="Treat coordinates as relative (0-999) instead of absolute pixels")
+    swipe_p.set_defaults(func=_handle_swipe)
 
-    key_p = sub.add_parser("key", help="Send keyevent by name (back/home/...) or numeric keycode")
-    key_p.add_argument("key", help="Key name or keycode")
+    key_p = sub.add_parser("key", help="Send keyevent(s) by name (back/home/...) or numeric keycode")
+    key_p.add_argument("key", nargs="+", help="Key name(s) or keycode(s), sent in order in a single call")
+    key_p.set_defaults(func=_handle_key)
 
     text_p = sub.add_parser("text", help="Type text via adb input text")
     text_p.add_argument("text", help="Text to type")
+    text_p.set_defaults(func=_handle_text)
 
     app_p = sub.add_parser("app", help="Launch app by package name or alias")
     app_p.add_argument("name", help="Package name (com.xxx) or alias (wechat/微信/settings/...)")
+    app_p.set_defaults(func=_handle_app)
 
     stop_p = sub.add_parser("stop", help="Force-stop app by package name or alias")
     stop_p.add_argument("name", help="Package name (com.xxx) or alias")
+    stop_p.set_defaults(func=_handle_stop)
 
     shell_p = sub.add_parser("shell", help="Run raw adb shell command")
     shell_p.add_argument("shell_args", nargs=argparse.REMAINDER, help="Command after 'shell'")
+    shell_p.set_defaults(func=_handle_shell)
+
+    sub.add_parser(
+        "daemon",
+        help="Serve commands for --device over a unix socket, reusing one adb shell session",
+    )
 
     return p
 
 
-def main(argv: Optional[Sequence[str]] = None) -> int:
-    args = build_parser().parse_args(argv)
+def _convert_coordinates_if_needed(args: argparse.Namespace, x: int, y: int) -> Tuple[int, int]:
+    """Convert relative coordinates to absolute, clamping out-of-range values."""
+    if not args.relative:
+        # Plausible absolute coordinates are passed through as-is; only
+        # obviously bogus ones are worth a screen-size query to clamp.
+        if 0 <= x <= MAX_PLAUSIBLE_COORD and 0 <= y <= MAX_PLAUSIBLE_COORD:
+            return x, y
+        if COORDINATE_CONVERSION_AVAILABLE:
+            try:
+                screen_info = _screen_info(args.adb, args.device)
+                valid_x, valid_y, was_corrected = validate_coordinates(x, y, screen_info['width'], screen_info['height'])
+                if was_corrected:
+                    print(f"⚠️ 绝对坐标已修正: ({x}, {y}) -> ({valid_x}, {valid_y})", file=sys.stderr)
+                return valid_x, valid_y
+            except Exception:
+                return x, y
+        return x, y
+
+    if not COORDINATE_CONVERSION_AVAILABLE:
+        print("Error: Coordinate conversion not available", file=sys.stderr)
+        return x, y
 
-    # Validate wait parameter
-    if hasattr(args, 'wait') and args.wait < 0:
-        print("Error: --wait time cannot be negative.", file=sys.stderr)
-        return 1
-    if hasattr(args, 'wait') and args.wait > 60:
-        print("Error: --wait time cannot exceed 60 seconds.", file=sys.stderr)
-        return 1
+    try:
+        # Get screen info for conversion
+        screen_info = _screen_info(args.adb, args.device)
 
-    # Validate relative coordinate availability
-    if hasattr(args, 'relative') and args.relative and not COORDINATE_CONVERSION_AVAILABLE:
-        print("Error: --relative requires coordinate conversion functions which are not available.", file=sys.stderr)
-        return 1
+        # First validate relative coordinates (Open-AutoGLM style: 0-999)
+        if x < 0 or x > 999 or y < 0 or y > 999:
+            print(f"⚠️ 相对坐标超出范围 (0-999): ({x}, {y})", file=sys.stderr)
+            x = max(0, min(999, x))
+            y = max(0, min(999, y))
+            print(f"✂️ 已修正相对坐标为: ({x}, {y})", file=sys.stderr)
 
-    adb = AdbClient(adb=args.adb, device=args.device, timeout_s=args.timeout)
+        # Convert to absolute coordinates
+        abs_x, abs_y = convert_relative_to_absolute(x, y, screen_info['width'], screen_info['height'])
 
-    # Helper function to convert relative coordinates to absolute
-    def convert_coordinates_if_needed(x: int, y: int) -> tuple[int, int]:
-        if not hasattr(args, 'relative') or not args.relative:
-            # For absolute coordinates, still validate boundaries
-            if COORDINATE_CONVERSION_AVAILABLE:
-                try:
-                    screen_info = get_accurate_screen_info(args.adb, args.device)
-                    valid_x, valid_y, was_corrected = validate_coordinates(x, y, screen_info['width'], screen_info['height'])
-                    if was_corrected:
-                        print(f"⚠️ 绝对坐标已修正: ({x}, {y}) -> ({valid_x}, {valid_y})", file=sys.stderr)
-                    return valid_x, valid_y
-                except Exception:
-                    return x, y
-            return x, y
+        # Validate absolute coordinates
+        valid_x, valid_y, was_corrected = validate_coordinates(abs_x, abs_y, screen_info['width'], screen_info['height'])
 
-        if not COORDINATE_CONVERSION_AVAILABLE:
-            print("Error: Coordinate conversion not available", file=sys.stderr)
-            return x, y
+        print(f"🔄 转换相对坐标 ({x}, {y}) -> 绝对坐标 ({valid_x}, {valid_y})", file=sys.stderr)
 
-        try:
-            # Get screen info for conversion
-            screen_info = get_accurate_screen_info(args.adb, args.device)
+        if was_corrected and (valid_x != abs_x or valid_y != abs_y):
+            print(f"⚠️ 绝对坐标已自动修正: ({abs_x}, {abs_y}) -> ({valid_x}, {valid_y})", file=sys.stderr)
 
-            # First validate relative coordinates (Open-AutoGLM style: 0-999)
-            if x < 0 or x > 999 or y < 0 or y > 999:
-                print(f"⚠️ 相对坐标超出范围 (0-999): ({x}, {y})", file=sys.stderr)
-                x = max(0, min(999, x))
-                y = max(0, min(999, y))
-                print(f"✂️ 已修正相对坐标为: ({x}, {y})", file=sys.stderr)
+        return valid_x, valid_y
 
-            # Convert to absolute coordinates
-            abs_x, abs_y = convert_relative_to_absolute(x, y, screen_info['width'], screen_info['height'])
+    except Exception as e:
+        print(f"⚠️ 坐标转换失败，使用原始坐标: {e}", file=sys.stderr)
+        return x, y
+
+
+def _execute_with_auto_view(args: argparse.Namespace, command_func, *command_args, **command_kwargs) -> int:
+    """Run a screen-changing command, then auto-view the result if enabled."""
+    # Record start time to calculate remaining timeout
+    start_time = time.time()
+
+    result = command_func(*command_args, **command_kwargs)
+    auto_view_desc = None
+
+    # Text mode prints the command result first so that a streamed auto-view
+    # description lands after it.
+    if not args.json:
+        _print_result(result, False)
+
+    # Only handlers for screen-changing commands call this wrapper.
+    if args.auto_view and result.ok:
+        # Calculate remaining timeout for auto-view; the wait is handed to
+        # auto-view so the subprocess path can overlap it with interpreter startup.
+        elapsed_time = time.time() - start_time
+        remaining_timeout = max(10, args.timeout - elapsed_time - args.wait)  # Minimum 10 seconds for auto-view
+
+        auto_view_desc = _auto_view_screen(
+            adb=args.adb,
+            device=args.device,
+            timeout=int(remaining_timeout),
+            as_json=args.json,
+            pre_wait=args.wait,
+        )
 
-            # Validate absolute coordinates
-            valid_x, valid_y, was_corrected = validate_coordinates(abs_x, abs_y, screen_info['width'], screen_info['height'])
+    if args.json:
+        _print_result(result, True, auto_view_desc)
+    elif auto_view_desc:
+        print(SCREEN_VIEW_HEADER)
+        print(auto_view_desc)
+    return 0 if result.ok else result.returncode or 1
 
-            print(f"🔄 转换相对坐标 ({x}, {y}) -> 绝对坐标 ({valid_x}, {valid_y})", file=sys.stderr)
 
-            if was_corrected and (valid_x != abs_x or valid_y != abs_y):
-                print(f"⚠️ 绝对坐标已自动修正: ({abs_x}, {abs_y}) -> ({valid_x}, {valid_y})", file=sys.stderr)
+def _handle_connect(args: argparse.Namespace, adb: AdbClient) -> int:
+    _print_result(adb.connect(), args.json)
+    return 0
 
-            return valid_x, valid_y
 
-        except Exception as e:
-            print(f"⚠️ 坐标转换失败，使用原始坐标: {e}", file=sys.stderr)
-            return x, y
+def _handle_devices(args: argparse.Namespace, adb: AdbClient) -> int:
+    _print_result(adb.devices(), args.json)
+    return 0
 
-    # Helper function to handle auto-view after operations
-    def execute_with_auto_view(command_func, *command_args, **command_kwargs) -> int:
-        # Record start time to calculate remaining timeout
-        start_time = time.time()
-
-        result = command_func(*command_args, **command_kwargs)
-        auto_view_desc = None
-
-        if hasattr(args, 'auto_view') and args.auto_view and result.ok:
-            # Auto-view only for commands that modify the screen
-            auto_view_commands = {"tap", "swipe", "key", "text", "app"}
-            if args.cmd in auto_view_commands:
-                # Add wait time if specified
-                if hasattr(args, 'wait') and args.wait > 0:
-                    time.sleep(args.wait)
-
-                # Calculate remaining timeout for auto-view
-                elapsed_time = time.time() - start_time
-                # elapsed_time already includes the wait time (since wait is executed before this point)
-                # So we don't need to subtract wait time again
-                remaining_timeout = max(10, args.timeout - elapsed_time)  # Minimum 10 seconds for auto-view
-
-                auto_view_desc = _auto_view_screen(
-                    adb=args.adb,
-                    device=args.device,
-                    timeout=int(remaining_timeout),
-                    as_json=args.json
-                )
-
-        _print_result(result, args.json, auto_view_desc)
-        return 0 if result.ok else result.returncode or 1
-
-    if args.cmd == "connect":
-        _print_result(adb.connect(), args.json)
-        return 0
 
-    if args.cmd == "devices":
-        _print_result(adb.devices(), args.json)
-        return 0
+def _handle_tap(args: argparse.Namespace, adb: AdbClient) -> int:
+    # Convert coordinates if needed
+    abs_x, abs_y = _convert_coordinates_if_needed(args, args.x, args.y)
+    return _execute_with_auto_view(args, adb.tap, abs_x, abs_y)
 
-    if args.cmd == "tap":
-        # Convert coordinates if needed
-        abs_x, abs_y = convert_coordinates_if_needed(args.x, args.y)
-        return execute_with_auto_view(adb.tap, abs_x, abs_y)
 
-    if args.cmd == "swipe":
-        # Convert coordinates if needed
-        abs_x1, abs_y1 = convert_coordinates_if_needed(args.x1, args.y1)
-        abs_x2, abs_y2 = convert_coordinates_if_needed(args.x2, args.y2)
-        return execute_with_auto_view(adb.swipe, abs_x1, abs_y1, abs_x2, abs_y2, args.duration)
+def _handle_swipe(args: argparse.Namespace, adb: AdbClient) -> int:
+    # Convert coordinates if needed
+    abs_x1, abs_y1 = _convert_coordinates_if_needed(args, args.x1, args.y1)
+    abs_x2, abs_y2 = _convert_coordinates_if_needed(args, args.x2, args.y2)
+    return _execute_with_auto_view(args, adb.swipe, abs_x1, abs_y1, abs_x2, abs_y2, args.duration)
 
-    if args.cmd == "key":
-        return execute_with_auto_view(adb.key, args.key)
 
-    if args.cmd == "text":
-        return execute_with_auto_view(adb.text, args.text)
+def _handle_key(args: argparse.Namespace, adb: AdbClient) -> int:
+    return _execute_with_auto_view(args, adb.key, *args.key)
 
-    if args.cmd == "app":
-        return execute_with_auto_view(adb.app_start, args.name)
 
-    if args.cmd == "stop":
-        _print_result(adb.app_stop(args.name), args.json)
-        return 0
+def _handle_text(args: argparse.Namespace, adb: AdbClient) -> int:
+    return _execute_with_auto_view(args, adb.text, args.text)
 
-    if args.cmd == "shell":
-        if not args.shell_args:
-            print("No shell command provided.", file=sys.stderr)
-            return 2
-        _print_result(adb.shell(*args.shell_args), args.json)
-        return 0
 
-    print(f"Unknown command: {args.cmd}", file=sys.stderr)
-    return 2
+def _handle_app(args: argparse.Namespace, adb: AdbClient) -> int:
+    return _execute_with_auto_view(args, adb.app_start, args.name)
+
+
+def _handle_stop(args: argparse.Namespace, adb: AdbClient) -> int:
+    _print_result(adb.app_stop(args.name), args.json)
+    return 0
+
+
+def _handle_shell(args: argparse.Namespace, adb: AdbClient) -> int:
+    if not args.shell_args:
+        print("No shell command provided.", file=sys.stderr)
+        return 2
+    _print_result(adb.shell(*args.shell_args), args.json)
+    return 0
+
+
+def _execute(args: argparse.Namespace, adb: AdbClient) -> int:
+    """Run one parsed command against an existing client (CLI or daemon)."""
+    # Validate wait parameter
+    if args.wait < 0:
+        print("Error: --wait time cannot be negative.", file=sys.stderr)
+        return 1
+    if args.wait > 60:
+        print("Error: --wait time cannot exceed 60 seconds.", file=sys.stderr)
+        return 1
+
+    # Validate relative coordinate availability
+    if args.relative and not COORDINATE_CONVERSION_AVAILABLE:
+        print("Error: --relative requires coordinate conversion functions which are not available.", file=sys.stderr)
+        return 1
+
+    return args.func(args, adb)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(argv) if argv is not None else sys.argv[1:]
+    args = build_parser().parse_args(argv)
+
+    if args.cmd == "daemon":
+        return _serve_daemon(args)
+
+    if args.use_daemon:
+        forwarded = _forward_to_daemon(argv, args.device, args.timeout + args.wait + DAEMON_REPLY_GRACE_S)
+        if forwarded is not None:
+            return forwarded
+
+    adb = AdbClient(adb=args.adb, device=args.device, timeout_s=args.timeout)
+    try:
+        return _execute(args, adb)
+    finally:
+        adb.close()
 
 
 if __name__ == "__main__":
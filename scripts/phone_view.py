@@ -2,17 +2,28 @@
 
 import argparse
 import base64
+import functools
+import http.client
+import io
 import json
 import os
+import queue
 import re
+import shlex
+import shutil
+import struct
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 try:
     from PIL import Image
@@ -20,6 +31,19 @@ try:
 except ImportError:
     PIL_AVAILABLE = False
 
+# pybase64 提供 SIMD 实现的 b64encode，接口与标准库一致；未安装时使用标准库
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+# orjson 序列化含大段 base64 的结果更快；未安装时使用标准库 json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 DEFAULT_DEVICE = "127.0.0.1:5555"
 DEFAULT_MODEL_URL = "http://127.0.0.1:1234/v1"
@@ -35,6 +59,22 @@ class CmdResult:
     returncode: int
 
 
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """序列化命令的 JSON 输出（非 ASCII 字符原样输出）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    # 与 orjson 的紧凑输出一致
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> str:
+    # subprocess 只有在可执行文件带目录、close_fds=False 时才走 posix_spawn 快路径
+    return shutil.which(name) or name
+
+
 def _run(cmd: Sequence[str], timeout_s: int) -> CmdResult:
     try:
         p = subprocess.run(
@@ -43,6 +83,8 @@ def _run(cmd: Sequence[str], timeout_s: int) -> CmdResult:
             stderr=subprocess.PIPE,
             text=False,
             timeout=timeout_s,
+            executable=_which(cmd[0]),
+            close_fds=False,
         )
         return CmdResult(
             ok=p.returncode == 0,
@@ -57,45 +99,406 @@ def _run(cmd: Sequence[str], timeout_s: int) -> CmdResult:
         return CmdResult(ok=False, command=list(cmd), stdout=out, stderr=err + "\nTIMEOUT", returncode=124)
 
 
-def _run_bytes(cmd: Sequence[str], timeout_s: int) -> Tuple[int, bytes, bytes]:
-    p = subprocess.run(
-        list(cmd),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        timeout=timeout_s,
-    )
-    return p.returncode, p.stdout or b"", p.stderr or b""
+def _run_bytes(cmd: Sequence[str], timeout_s: int) -> Tuple[int, bytearray, str]:
+    """
+    运行命令并返回 (退出码, stdout 字节, stderr 文本)
+
+    截图 PNG 有数 MB：直接按 1MB 块从管道读入同一个 bytearray 并原样返回，
+    避免 communicate 逐块收集再拼接、以及转换为 bytes 带来的额外拷贝。
+    stderr 写入临时文件，不必再开线程读第二个管道。超时则结束进程并抛出 TimeoutExpired。
+    """
+    with tempfile.TemporaryFile() as err:
+        p = subprocess.Popen(
+            list(cmd),
+            stdout=subprocess.PIPE,
+            stderr=err,
+            executable=_which(cmd[0]),
+            close_fds=False,
+        )
+        timed_out = threading.Event()
+
+        def _kill() -> None:
+            timed_out.set()
+            p.kill()
+
+        timer = threading.Timer(timeout_s, _kill)
+        timer.start()
+        buf = bytearray()
+        try:
+            fd = p.stdout.fileno()
+            while True:
+                chunk = os.read(fd, 1 << 20)
+                if not chunk:
+                    break
+                buf += chunk
+            rc = p.wait()
+        finally:
+            timer.cancel()
+            p.stdout.close()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(list(cmd), timeout_s)
+        err.seek(0)
+        return rc, buf, err.read().decode("utf-8", errors="replace")
 
 
 def _adb_base(adb: str, device: str) -> List[str]:
     return [adb, "-s", device]
 
 
-def get_accurate_screen_info(adb: str, device: str, screenshot_path: Optional[str] = None) -> dict:
-    """获取精确屏幕信息，优先使用截图尺寸"""
+# 常驻 shell 中每条命令结束后回显的标记：
+#   stderr 上的 __ERR_<令牌>__，随后 stdout 上的 __END_<退出码>_<令牌>__
+_SHELL_MARK_RE = re.compile(r"__(?:END_(\d+)|ERR)_([0-9a-f]{32})__$")
+
+# 当前生效的常驻 shell，按 (adb, device) 索引
+_active_shells: Dict[Tuple[str, str], "AdbShell"] = {}
+
+
+def _pump_lines(stream, lines: "queue.Queue[Optional[str]]") -> None:
+    # 在守护线程中读取 shell 输出，使主线程的读取可以超时
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+class AdbShell:
+    """
+    常驻的 `adb shell` 会话
+
+    作为上下文管理器使用：进入后，同一设备上经由 `_adb_shell` 执行的命令
+    都写入同一个 `adb -s DEV shell` 子进程，省去每次建立 adb 传输的开销；
+    退出时关闭会话。子进程在第一条命令时才启动，只走 exec-out 的调用不会多开进程。
+    不关心结果的清理命令可用 `defer` 登记，在退出时随会话关闭一并执行。
+    也可以直接持有实例调用 `exec`（phone_control 的 AdbClient 即如此），用完后调用 `close`。
+    """
+
+    def __init__(self, adb: str, device: str, timeout_s: int = 30):
+        self.adb = adb
+        self.device = device
+        self.timeout_s = timeout_s
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: Optional["queue.Queue[Optional[str]]"] = None
+        self._err_lines: Optional["queue.Queue[Optional[str]]"] = None
+        # 后台线程的 wm 查询可能与截图回退路径同时使用会话
+        self._lock = threading.Lock()
+        self._deferred: List[str] = []
+        self._registered = False
+
+    def __enter__(self) -> "AdbShell":
+        key = (self.adb, self.device)
+        # 嵌套使用时沿用外层会话
+        if key not in _active_shells:
+            _active_shells[key] = self
+            self._registered = True
+        return _active_shells[key]
+
+    def __exit__(self, *exc_info) -> None:
+        if self._registered:
+            _active_shells.pop((self.adb, self.device), None)
+            self._registered = False
+            self._run_deferred()
+            self.close()
+
+    def defer(self, cmd: str) -> None:
+        """登记一条在会话退出时执行、不等待结果的命令"""
+        with self._lock:
+            self._deferred.append(cmd)
+
+    def _run_deferred(self) -> None:
+        with self._lock:
+            cmds, self._deferred = self._deferred, []
+        if not cmds:
+            return
+        script = "; ".join(cmds)
+        try:
+            proc = self._ensure_proc()
+            # 随后 close() 关闭 stdin，shell 执行完这些命令后退出
+            proc.stdin.write(f"({script}) </dev/null >/dev/null 2>&1\n")
+            proc.stdin.flush()
+        except OSError:
+            self.close()
+            _run(_adb_base(self.adb, self.device) + ["shell", script], timeout_s=self.timeout_s)
+
+    def _ensure_proc(self) -> subprocess.Popen:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+
+        cmd = _adb_base(self.adb, self.device) + ["shell"]
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            executable=_which(cmd[0]),
+            close_fds=False,
+        )
+        self._lines = queue.Queue()
+        self._err_lines = queue.Queue()
+        threading.Thread(target=_pump_lines, args=(self._proc.stdout, self._lines), daemon=True).start()
+        threading.Thread(target=_pump_lines, args=(self._proc.stderr, self._err_lines), daemon=True).start()
+        return self._proc
+
+    def exec(self, cmd: str, timeout_s: Optional[int] = None) -> CmdResult:
+        """
+        在会话中执行一条命令行，会话无法启动或写入时退回单次 `adb shell` 调用
+
+        命令行整体加引号交给子进程 `sh -c` 运行（stdin 置空），随后在 stderr、stdout 上依次回显结束标记，
+        stdout 的标记带退出码；命令中的注释、未闭合的引号等只影响子进程，不会吞掉结束标记。
+        stdout 与 stderr 分别收集；不支持 shell 协议的设备上两者本就合并，stderr 内容留在 stdout 中。
+        """
+        with self._lock:
+            return self._exec(cmd, timeout_s)
+
+    def _exec(self, cmd: str, timeout_s: Optional[int]) -> CmdResult:
+        timeout_s = self.timeout_s if timeout_s is None else timeout_s
+        full_cmd = _adb_base(self.adb, self.device) + ["shell", cmd]
+        tok = uuid.uuid4().hex
+        try:
+            proc = self._ensure_proc()
+            proc.stdin.write(
+                f"sh -c {shlex.quote(cmd)} </dev/null; __rc=$?; echo __ERR_{tok}__ >&2; echo __END_${{__rc}}_{tok}__\n"
+            )
+            proc.stdin.flush()
+        except OSError:
+            self.close()
+            return _run(full_cmd, timeout_s=timeout_s)
+
+        output: List[str] = []
+        errors: List[str] = []
+        deadline = time.monotonic() + timeout_s
+        try:
+            match = self._collect(self._lines, tok, deadline, output)
+            if match is not None and match.group(1) is None:
+                # __ERR_ 标记出现在 stdout 中：两路输出已合并，继续读到 __END_ 标记
+                match = self._collect(self._lines, tok, deadline, output)
+            elif match is not None and self._collect(self._err_lines, tok, deadline, errors) is None:
+                match = None
+        except queue.Empty:
+            # 会话状态未知，丢弃它，下一条命令重新建立
+            self.close()
+            return CmdResult(
+                ok=False, command=full_cmd, stdout="".join(output), stderr="".join(errors) + "\nTIMEOUT", returncode=124
+            )
+        if match is None:
+            # adb shell 意外退出（如设备断开）；命令可能已经执行，不再重试
+            self.close()
+            return CmdResult(
+                ok=False,
+                command=full_cmd,
+                stdout="",
+                stderr="".join(output) + "".join(errors) + "adb shell session ended unexpectedly",
+                returncode=proc.returncode or 1,
+            )
+        rc = int(match.group(1))
+        return CmdResult(ok=rc == 0, command=full_cmd, stdout="".join(output), stderr="".join(errors), returncode=rc)
+
+    @staticmethod
+    def _collect(
+        lines: "queue.Queue[Optional[str]]", tok: str, deadline: float, output: List[str]
+    ) -> Optional["re.Match[str]"]:
+        """读到本次命令的下一个结束标记为止，标记前的内容追加到 output；流已结束时返回 None，超时抛出 queue.Empty"""
+        while True:
+            line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            if line is None:
+                return None
+            match = _SHELL_MARK_RE.search(line.rstrip("\r\n"))
+            if match and match.group(2) == tok:
+                output.append(line[:match.start()])
+                return match
+            output.append(line)
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+
+
+def _adb_shell(adb: str, device: str, cmd: str, timeout_s: int) -> CmdResult:
+    """执行一条 shell 命令：有活动的 AdbShell 会话时复用它，否则单次调用 adb shell"""
+    shell = _active_shells.get((adb, device))
+    if shell is not None:
+        return shell.exec(cmd, timeout_s=timeout_s)
+    return _run(_adb_base(adb, device) + ["shell", cmd], timeout_s=timeout_s)
+
+
+def _adb_shell_background(adb: str, device: str, cmd: str, timeout_s: int) -> None:
+    """执行不需要结果的命令：有活动会话时推迟到会话退出时执行，否则放到后台线程"""
+    shell = _active_shells.get((adb, device))
+    if shell is not None:
+        shell.defer(cmd)
+        return
+    threading.Thread(target=_run, args=(_adb_base(adb, device) + ["shell", cmd], timeout_s)).start()
+
+
+# 批量执行 shell 命令时，各命令输出之间的分隔标记
+_BATCH_SEP = "__PHONE_VIEW_SEP__"
+
+
+def _adb_shell_batch(adb: str, device: str, cmds: List[str], timeout_s: int) -> List[str]:
+    """在一次 adb shell 调用中依次执行多条命令，返回每条命令各自的输出"""
+    script = f"; echo {_BATCH_SEP}; ".join(cmds)
+    res = _adb_shell(adb, device, script, timeout_s=timeout_s)
+    parts = res.stdout.split(_BATCH_SEP)
+    return (parts + [""] * len(cmds))[:len(cmds)]
+
+
+def _query_wm(adb: str, device: str) -> List[str]:
+    """一次调用获取 wm size 与 wm density 的输出"""
+    return _adb_shell_batch(adb, device, ["wm size", "wm density"], timeout_s=10)
+
+
+def _start_wm_query(adb: str, device: str) -> "Future[List[str]]":
+    """在后台线程中查询 wm 信息，使其与截图并行进行"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(_query_wm, adb, device)
+    executor.shutdown(wait=False)
+    return future
+
+
+# 设备屏幕参数（wm size / wm density）的跨进程缓存，按设备序列号索引
+_DIMS_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "phone_view", "dims.json"
+)
+_DIMS_CACHE_TTL_S = 24 * 3600
+
+
+@functools.lru_cache(maxsize=None)
+def _read_dims_cache() -> Dict[str, Any]:
+    try:
+        with open(_DIMS_CACHE_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _cached_dims(device: str) -> Optional[Tuple[int, int, int]]:
+    """返回缓存的 (宽, 高, 密度)，不存在或已过期时返回 None"""
+    entry = _read_dims_cache().get(device)
+    try:
+        if time.time() - entry["ts"] < _DIMS_CACHE_TTL_S:
+            return int(entry["width"]), int(entry["height"]), int(entry["density"])
+    except (TypeError, KeyError, ValueError):
+        pass
+    return None
+
+
+def _update_dims_cache(device: str, dims: Optional[Tuple[int, int, int]]) -> None:
+    """写入设备的缓存项（dims 为 None 时删除）；写缓存失败不影响主流程"""
+    data = dict(_read_dims_cache())
+    if dims is None:
+        if data.pop(device, None) is None:
+            return
+    else:
+        data[device] = {"width": dims[0], "height": dims[1], "density": dims[2], "ts": time.time()}
+
+    cache_dir = os.path.dirname(_DIMS_CACHE_PATH)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, _DIMS_CACHE_PATH)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return
+    _read_dims_cache.cache_clear()
+
+
+def _parse_wm_outputs(device: str, wm_outputs: List[str]) -> Tuple[Optional[Tuple[int, int]], Optional[int]]:
+    """解析 `_query_wm` 的结果；尺寸和密度都解析成功时写入缓存"""
+    size = _parse_wm_size(wm_outputs[0])
+    density = _parse_wm_density(wm_outputs[1])
+    if size and density:
+        _update_dims_cache(device, (size[0], size[1], density))
+    return size, density
+
+
+def _needs_wm_query(device: str, need_density: bool) -> bool:
+    """有缓存时不必查询；尺寸可从截图读出，只有需要密度才查询 wm"""
+    if _cached_dims(device):
+        return False
+    return need_density
+
+
+def _png_size(header: bytes) -> Tuple[int, int]:
+    """从 PNG 文件头读取宽高：8 字节签名后紧跟 IHDR 块，宽高位于第 16-24 字节"""
+    if len(header) < 24 or header[:8] != b"\x89PNG\r\n\x1a\n" or header[12:16] != b"IHDR":
+        raise ValueError("not a PNG file")
+    return struct.unpack(">II", header[16:24])
+
+
+def get_accurate_screen_info(
+    adb: str,
+    device: str,
+    screenshot_path: Optional[str] = None,
+    wm_outputs: Optional[List[str]] = None,
+    need_density: bool = True,
+) -> dict:
+    """
+    获取精确屏幕信息，优先使用截图尺寸
+
+    wm_outputs 为预先查询到的 `_query_wm` 结果，提供时不再调用 adb 查询 wm 信息。
+    need_density=False 时，从截图取得尺寸后不再为密度调用 adb，density 为 None。
+    wm 查询结果按设备缓存 24 小时（见 `_DIMS_CACHE_PATH`）。缓存只在提供截图时使用：
+    尺寸以截图为准并据此校验缓存，密度取自缓存而不调用 adb。没有截图时总是查询设备，
+    因为缓存按 adb 地址索引，同一地址（如 127.0.0.1:5555）可能已换成另一台设备。
+    """
+    wm_size: Optional[Tuple[int, int]] = None
+    wm_density: Optional[int] = None
+    cached = None
+    if wm_outputs is not None:
+        wm_size, wm_density = _parse_wm_outputs(device, wm_outputs)
+    elif screenshot_path:
+        cached = _cached_dims(device)
 
     # 方法1：从截图获取精确尺寸（最准确）
-    if screenshot_path and os.path.exists(screenshot_path) and PIL_AVAILABLE:
+    if screenshot_path and os.path.exists(screenshot_path):
         try:
-            with Image.open(screenshot_path) as img:
-                actual_width, actual_height = img.size
-                print(f"✅ 从截图获取精确尺寸: {actual_width}x{actual_height}", file=sys.stderr)
-                # 从截图获取尺寸后，继续获取密度信息
+            with open(screenshot_path, "rb") as f:
+                actual_width, actual_height = _png_size(f.read(24))
+            print(f"✅ 从截图获取精确尺寸: {actual_width}x{actual_height}", file=sys.stderr)
+            # 截图尺寸与缓存不符（横竖屏切换除外）说明分辨率变了，缓存作废
+            if cached and sorted(cached[:2]) != sorted((actual_width, actual_height)):
+                _update_dims_cache(device, None)
+                cached = None
+            # 从截图获取尺寸后，继续获取密度信息
+            if wm_outputs is not None:
+                density = wm_density or 420
+            elif cached:
+                density = cached[2]
+            elif need_density:
                 density = get_screen_density_via_adb(adb, device)
-                return {
-                    "width": actual_width,
-                    "height": actual_height,
-                    "density": density,
-                    "aspect_ratio": actual_width / actual_height,
-                    "source": "screenshot"
-                }
+            else:
+                density = None
+            return {
+                "width": actual_width,
+                "height": actual_height,
+                "density": density,
+                "aspect_ratio": actual_width / actual_height,
+                "source": "screenshot"
+            }
         except Exception as e:
             print(f"⚠️ 从截图获取尺寸失败: {e}", file=sys.stderr)
 
-    # 方法2：使用ADB命令（备用方案）
+    # 方法2：使用ADB命令（备用方案）——wm size 与 wm density 合并为一次调用
     try:
-        width, height = get_screen_size_via_adb(adb, device)
-        density = get_screen_density_via_adb(adb, device)
+        if wm_outputs is None:
+            wm_size, wm_density = _parse_wm_outputs(device, _query_wm(adb, device))
+        width, height = wm_size if wm_size else _get_screen_size_via_dumpsys(adb, device)
+        density = wm_density or 420
         return {
             "width": width,
             "height": height,
@@ -115,28 +518,52 @@ def get_accurate_screen_info(adb: str, device: str, screenshot_path: Optional[st
         }
 
 
+# wm / dumpsys 输出中的屏幕参数
+_RE_PHYS_SIZE = re.compile(r'Physical size: (\d+)x(\d+)')
+_RE_PHYS_DENS = re.compile(r'Physical density: (\d+)')
+_RE_INIT_DIM = re.compile(r'init=(\d+)x(\d+)')
+_RE_UNRESTRICT = re.compile(r'mUnrestrictedScreen=\((\d+),(\d+)\)')
+
+
+def _parse_wm_size(output: str) -> Optional[Tuple[int, int]]:
+    """解析 wm size 输出，格式: Physical size: 1080x2400"""
+    match = _RE_PHYS_SIZE.search(output)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    return None
+
+
+def _parse_wm_density(output: str) -> Optional[int]:
+    """解析 wm density 输出，格式: Physical density: 420"""
+    match = _RE_PHYS_DENS.search(output)
+    if match:
+        return int(match.group(1))
+    return None
+
+
 def get_screen_size_via_adb(adb: str, device: str) -> Tuple[int, int]:
     """通过ADB获取屏幕尺寸"""
-    base = _adb_base(adb, device)
-
     # 方法1：wm size 命令
-    cmd_res = _run(base + ["shell", "wm", "size"], timeout_s=10)
+    cmd_res = _adb_shell(adb, device, "wm size", timeout_s=10)
     if cmd_res.ok:
-        # 输出格式: Physical size: 1080x2400
-        match = re.search(r'Physical size: (\d+)x(\d+)', cmd_res.stdout)
-        if match:
-            width, height = int(match.group(1)), int(match.group(2))
-            return width, height
+        size = _parse_wm_size(cmd_res.stdout)
+        if size:
+            return size
+
+    return _get_screen_size_via_dumpsys(adb, device)
 
+
+def _get_screen_size_via_dumpsys(adb: str, device: str) -> Tuple[int, int]:
+    """wm size 不可用时，从 dumpsys 输出中解析屏幕尺寸"""
     # 方法2：dumpsys window displays 命令
-    cmd_res = _run(base + ["shell", "dumpsys", "window", "displays"], timeout_s=10)
-    width, height = parse_display_info(cmd_res.stdout)
-    if width != 1080 or height != 2400:  # 如果不是默认值，说明解析成功
-        return width, height
+    cmd_res = _adb_shell(adb, device, "dumpsys window displays", timeout_s=10)
+    size = parse_display_info(cmd_res.stdout)
+    if size is not None:
+        return size
 
     # 方法3：dumpsys window 命令
-    cmd_res = _run(base + ["shell", "dumpsys", "window"], timeout_s=10)
-    match = re.search(r'mUnrestrictedScreen=\((\d+),(\d+)\)', cmd_res.stdout)
+    cmd_res = _adb_shell(adb, device, "dumpsys window", timeout_s=10)
+    match = _RE_UNRESTRICT.search(cmd_res.stdout)
     if match:
         return int(match.group(1)), int(match.group(2))
 
@@ -146,14 +573,11 @@ def get_screen_size_via_adb(adb: str, device: str) -> Tuple[int, int]:
 
 def get_screen_density_via_adb(adb: str, device: str) -> int:
     """通过ADB获取屏幕密度"""
-    base = _adb_base(adb, device)
-
-    density_res = _run(base + ["shell", "wm", "density"], timeout_s=10)
+    density_res = _adb_shell(adb, device, "wm density", timeout_s=10)
     if density_res.ok:
-        # 输出格式: Physical density: 420
-        density_match = re.search(r'Physical density: (\d+)', density_res.stdout)
-        if density_match:
-            return int(density_match.group(1))
+        density = _parse_wm_density(density_res.stdout)
+        if density:
+            return density
 
     return 420  # 默认值
 
@@ -252,110 +676,195 @@ def validate_coordinates(x: int, y: int, screen_width: int, screen_height: int)
     return valid_x, valid_y, was_corrected
 
 
-def parse_relative_coordinates_from_text(description: str, screen_info: dict) -> List[dict]:
+# 描述文本中的元素标记，单次扫描即可按出现顺序取得标题行和带标记的行：
+#   标题行：数字编号开头且包含 **，如 "1. 🔥 **搜索框** (高优先级)"
+#   相对坐标：🎯 相对坐标：(500, 300)
+#   绝对坐标：🎯 坐标：(540, 300) - 向后兼容
+#   命令：💻 命令：python3 scripts/phone_control.py tap
+_LINE_TOKEN_PATTERNS = {
+    'rel': r'🎯 相对坐标：\((\d+),[^\S\n]*(\d+)\)',
+    'abs': r'🎯 坐标：\((\d+),[^\S\n]*(\d+)\)',
+    'command': r'💻 命令：([^📝\n]+)',
+}
+_RE_ELEMENT_TOKEN = re.compile(
+    r'(?P<header>^[^\S\n]*\d+\.[^\n]*\*\*[^\n]*)|' + '|'.join(_LINE_TOKEN_PATTERNS.values()),
+    re.M,
+)
+# 命令会吞掉同一行其后的内容，选定标记种类后在该行内单独匹配
+_RE_LINE_TOKEN = {kind: re.compile(pattern) for kind, pattern in _LINE_TOKEN_PATTERNS.items()}
+# 元素描述：**搜索框**
+_RE_ELEMENT_DESC = re.compile(r'\*\*(.+?)\*\*')
+# 优先级：(高优先级)
+_RE_PRIORITY = re.compile(r'\((高|中|低)优先级\)')
+
+_PRIORITY_MAP = {'高': 'high', '中': 'medium', '低': 'low'}
+
+
+def _line_kind(line: str, record: Dict[str, Any], relative: bool) -> Optional[str]:
     """
-    从文本描述中解析相对坐标信息
+    一行只认一种标记
+
+    relative 为真时依次检查相对坐标、绝对坐标（元素尚无坐标时）、命令；
+    否则不认相对坐标，依次检查绝对坐标、命令
+    """
+    if relative:
+        if '🎯 相对坐标：' in line:
+            return 'rel'
+        if '🎯 坐标：' in line and record['rel'] is None and record['abs'] is None:
+            return 'abs'
+    elif '🎯 坐标：' in line:
+        return 'abs'
+    if '💻 命令：' in line:
+        return 'command'
+    return None
+
+
+def _scan_elements(description: str, relative: bool = True) -> List[Dict[str, Any]]:
+    """
+    单次扫描描述文本，按标题行把坐标和命令归到各元素下
+
+    每项包含 element（描述/类型/优先级）、rel（最后一个相对坐标）、
+    abs（relative 为真时取第一个绝对坐标，否则取最后一个）和 command（最后一条命令）。
+    与逐行解析的规则一致：每行按 `_line_kind` 只认一种标记，且只取该行第一个；
+    第一个标题行之前的内容被忽略。
+    """
+    records: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    # 最近处理过的行的起始位置；同一行的后续标记跳过
+    line_start = -1
+    for match in _RE_ELEMENT_TOKEN.finditer(description):
+        line = match.group('header')
+        if line is not None:
+            element_match = _RE_ELEMENT_DESC.search(line)
+            priority_match = _RE_PRIORITY.search(line)
+            current = {
+                'element': {
+                    'description': element_match.group(1) if element_match else line.strip(),
+                    'type': 'unknown',
+                    'priority': _PRIORITY_MAP[priority_match.group(1)] if priority_match else 'medium',
+                },
+                'rel': None,
+                'abs': None,
+                'command': None,
+            }
+            records.append(current)
+            continue
+
+        if current is None:
+            continue
+        start = description.rfind('\n', 0, match.start()) + 1
+        if start == line_start:
+            continue
+        line_start = start
+        end = description.find('\n', start)
+        if end == -1:
+            end = len(description)
+        kind = _line_kind(description[start:end], current, relative)
+        token = _RE_LINE_TOKEN[kind].search(description, start, end) if kind else None
+        if token is None:
+            continue
+
+        if kind == 'command':
+            current['command'] = token.group(1).strip()
+        else:
+            current[kind] = (int(token.group(1)), int(token.group(2)))
+    return records
+
+
+def _parse_elements(description: str, screen_info: Optional[dict] = None, relative: bool = True) -> List[dict]:
+    """
+    从文本描述中解析可交互元素
+
+    相对坐标与绝对坐标有哪个填哪个；提供 screen_info 时再换算补齐另一种。
 
     Args:
         description: 视觉模型输出的文本描述
-        screen_info: 屏幕信息，用于坐标转换
+        screen_info: 屏幕信息（可选），用于坐标转换
+        relative: 是否识别相对坐标；为假时只认绝对坐标，多处给出时以最后一处为准
 
     Returns:
-        包含相对坐标的元素列表
+        元素列表，坐标位于 relative_coordinates / coordinates 键
     """
     elements = []
 
-    # 匹配相对坐标模式：🎯 相对坐标：(500, 300)
-    rel_coord_pattern = r'🎯 相对坐标：\((\d+),\s*(\d+)\)'
-    # 匹配绝对坐标模式：🎯 坐标：(540, 300) - 向后兼容
-    abs_coord_pattern = r'🎯 坐标：\((\d+),\s*(\d+)\)'
-    # 匹配命令模式：python3 scripts/phone_control.py tap
-    command_pattern = r'💻 命令：([^📝\n]+)'
-    # 匹配元素描述：**搜索框**
-    element_pattern = r'\*\*(.+?)\*\*'
-    # 匹配优先级：(高优先级)
-    priority_pattern = r'\((高|中|低)优先级\)'
-
-    lines = description.split('\n')
-    current_element = {}
-
-    for line in lines:
-        # 查找元素标题行（数字开头，包含**）
-        if re.match(r'^\d+\.', line.strip()) and '**' in line:
-            # 保存前一个元素（如果有）
-            if current_element:
-                elements.append(current_element)
-
-            # 提取元素描述
-            element_match = re.search(r'\*\*(.+?)\*\*', line)
-            priority_match = re.search(priority_pattern, line)
-
-            current_element = {
-                'description': element_match.group(1) if element_match else line.strip(),
-                'type': 'unknown',
-                'priority': 'medium'
+    for record in _scan_elements(description, relative):
+        element = record['element']
+        # 优先使用相对坐标（多处给出时以最后一处为准）
+        if record['rel']:
+            rel_x, rel_y = record['rel']
+            element['relative_coordinates'] = {
+                'x': rel_x,
+                'y': rel_y
             }
-
-            if priority_match:
-                priority_map = {'高': 'high', '中': 'medium', '低': 'low'}
-                current_element['priority'] = priority_map.get(priority_match.group(1), 'medium')
-
-        # 优先匹配相对坐标
-        elif '🎯 相对坐标：' in line and current_element:
-            coord_match = re.search(rel_coord_pattern, line)
-            if coord_match:
-                rel_x, rel_y = int(coord_match.group(1)), int(coord_match.group(2))
-                current_element['relative_coordinates'] = {
-                    'x': rel_x,
-                    'y': rel_y
-                }
-                # 同时计算绝对坐标供使用
+            # 同时计算绝对坐标供使用
+            if screen_info:
                 abs_x, abs_y = convert_relative_to_absolute(rel_x, rel_y, screen_info['width'], screen_info['height'])
-                current_element['coordinates'] = {
+                element['coordinates'] = {
                     'x': abs_x,
                     'y': abs_y
                 }
+            elif record['abs']:
+                element['coordinates'] = {
+                    'x': record['abs'][0],
+                    'y': record['abs'][1]
+                }
 
         # 向后兼容：绝对坐标
-        elif '🎯 坐标：' in line and current_element and 'coordinates' not in current_element:
-            coord_match = re.search(abs_coord_pattern, line)
-            if coord_match:
-                abs_x, abs_y = int(coord_match.group(1)), int(coord_match.group(2))
-                # 转换为相对坐标
+        elif record['abs']:
+            abs_x, abs_y = record['abs']
+            element['coordinates'] = {
+                'x': abs_x,
+                'y': abs_y
+            }
+            # 转换为相对坐标
+            if screen_info:
                 rel_x, rel_y = convert_absolute_to_relative(abs_x, abs_y, screen_info['width'], screen_info['height'])
-                current_element['coordinates'] = {
-                    'x': abs_x,
-                    'y': abs_y
-                }
-                current_element['relative_coordinates'] = {
+                element['relative_coordinates'] = {
                     'x': rel_x,
                     'y': rel_y
                 }
 
-        elif '💻 命令：' in line and current_element:
-            cmd_match = re.search(command_pattern, line)
-            if cmd_match:
-                current_element['command'] = cmd_match.group(1).strip()
+        if record['command'] is not None:
+            element['command'] = record['command']
 
-    # 添加最后一个元素
-    if current_element:
-        elements.append(current_element)
+        elements.append(element)
 
     return elements
 
 
-def parse_display_info(dumpsys_output: str) -> Tuple[int, int]:
-    """从dumpsys输出中解析屏幕信息"""
+def parse_relative_coordinates_from_text(description: str, screen_info: dict) -> List[dict]:
+    """
+    从文本描述中解析相对坐标信息
+
+    Args:
+        description: 视觉模型输出的文本描述
+        screen_info: 屏幕信息，用于坐标转换
+
+    Returns:
+        包含相对坐标的元素列表
+    """
+    return _parse_elements(description, screen_info)
+
+
+def parse_display_info(dumpsys_output: str) -> Optional[Tuple[int, int]]:
+    """从dumpsys输出中解析屏幕信息，未找到时返回 None"""
     # 简单的解析逻辑，可根据需要扩展
-    import re
     # 查找类似 "init=1080x2400" 的模式
-    match = re.search(r'init=(\d+)x(\d+)', dumpsys_output)
+    match = _RE_INIT_DIM.search(dumpsys_output)
     if match:
         return int(match.group(1)), int(match.group(2))
-    return 1080, 2400  # 默认值
+    return None
+
 
+def capture_screenshot(
+    adb: str, device: str, timeout_s: int, output_path: Optional[str] = None
+) -> Tuple[str, Optional[bytearray]]:
+    """
+    截图并保存到 output_path
 
-def capture_screenshot(adb: str, device: str, timeout_s: int, output_path: Optional[str] = None) -> str:
+    Returns:
+        (图片路径, PNG 字节)；exec-out 快路径直接返回内存中的字节，回退路径为 None
+    """
     if output_path is None:
         fd, output_path = tempfile.mkstemp(prefix="phone_screen_", suffix=".png")
         os.close(fd)
@@ -363,31 +872,109 @@ def capture_screenshot(adb: str, device: str, timeout_s: int, output_path: Optio
     base = _adb_base(adb, device)
 
     # Preferred: stream png via exec-out.
+    exec_out_error = ""
     try:
         rc, out, err = _run_bytes(base + ["exec-out", "screencap", "-p"], timeout_s=timeout_s)
         if rc == 0 and out:
             with open(output_path, "wb") as f:
                 f.write(out)
-            return output_path
+            return output_path, out
+        exec_out_error = err.strip() or f"returncode={rc}"
     except FileNotFoundError:
         raise RuntimeError(f"adb not found at '{adb}'")
     except subprocess.TimeoutExpired:
-        pass
+        exec_out_error = "TIMEOUT"
 
     # Fallback: write to device then pull.
     remote = f"/sdcard/phone_screen_{int(time.time())}.png"
-    r1 = _run(base + ["shell", "screencap", "-p", remote], timeout_s=timeout_s)
+    r1 = _adb_shell(adb, device, f"screencap -p {remote}", timeout_s=timeout_s)
     if not r1.ok:
-        raise RuntimeError(f"Failed to capture screenshot: {r1.stderr.strip() or r1.stdout.strip()}")
+        raise RuntimeError(
+            f"Failed to capture screenshot: {r1.stderr.strip() or r1.stdout.strip()} "
+            f"(exec-out: {exec_out_error})"
+        )
     r2 = _run(base + ["pull", remote, output_path], timeout_s=timeout_s)
-    _run(base + ["shell", "rm", "-f", remote], timeout_s=timeout_s)
+    # 清理设备上的临时截图不影响结果，不阻塞调用方
+    _adb_shell_background(adb, device, f"rm -f {remote}", timeout_s=timeout_s)
     if not r2.ok:
         raise RuntimeError(f"Failed to pull screenshot: {r2.stderr.strip() or r2.stdout.strip()}")
-    return output_path
+    return output_path, None
 
 
-def _post_json(url: str, payload: Dict[str, Any], timeout_s: int) -> Dict[str, Any]:
+# 按 (scheme, host, port) 缓存的 HTTP 长连接，连续调用模型时复用同一 TCP 连接
+_http_conns: Dict[Tuple[str, str, Optional[int]], http.client.HTTPConnection] = {}
+
+
+def _http_conn(scheme: str, host: str, port: Optional[int], timeout_s: int, fresh: bool = False) -> http.client.HTTPConnection:
+    key = (scheme, host, port)
+    conn = _http_conns.get(key)
+    if conn is None or fresh:
+        if conn is not None:
+            conn.close()
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = cls(host, port, timeout=timeout_s)
+        _http_conns[key] = conn
+    else:
+        conn.timeout = timeout_s
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout_s)
+    return conn
+
+
+def _post_json(
+    url: str,
+    payload: Dict[str, Any],
+    timeout_s: int,
+    splice: Optional[Tuple[str, bytes]] = None,
+) -> Dict[str, Any]:
+    """
+    POST JSON 并解析 JSON 响应
+
+    splice=(占位符, 数据) 时，payload 中唯一出现的占位符字符串在发送时被替换为数据
+    （须为无需 JSON 转义的 ASCII，如 base64）。数 MB 的图片数据因此不经过
+    json.dumps/encode 的复制，而是作为请求体的一段原样发送。
+    """
     body = json.dumps(payload).encode("utf-8")
+    chunks = [body]
+    if splice is not None:
+        head, _, tail = body.partition(splice[0].encode("ascii"))
+        chunks = [head, splice[1], tail]
+
+    parts = urllib.parse.urlsplit(url)
+    # 配置了代理（或非 http/https）时交给 urllib 处理
+    proxied = parts.scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(parts.hostname or "")
+    if parts.scheme not in ("http", "https") or not parts.hostname or proxied:
+        return _post_json_urllib(url, b"".join(chunks), timeout_s)
+
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    headers = {
+        "Content-Type": "application/json",
+        "Content-Length": str(sum(len(c) for c in chunks)),
+        "Connection": "keep-alive",
+    }
+
+    for attempt in range(2):
+        conn = _http_conn(parts.scheme, parts.hostname, parts.port, timeout_s, fresh=attempt > 0)
+        reused = conn.sock is not None
+        try:
+            conn.request("POST", path, body=chunks, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            # 复用的连接可能已被服务端关闭，换新连接重试一次
+            if reused and attempt == 0 and isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)):
+                continue
+            raise RuntimeError(f"Failed to connect to {url}: {e}")
+        if resp.status >= 400:
+            raise RuntimeError(f"HTTP {resp.status} calling {url}: {data.decode('utf-8', errors='replace')}")
+        return json.loads(data.decode("utf-8"))
+    raise RuntimeError(f"Failed to connect to {url}")
+
+
+def _post_json_urllib(url: str, body: bytes, timeout_s: int) -> Dict[str, Any]:
     req = urllib.request.Request(
         url,
         data=body,
@@ -405,6 +992,19 @@ def _post_json(url: str, payload: Dict[str, Any], timeout_s: int) -> Dict[str, A
         raise RuntimeError(f"Failed to connect to {url}: {e}")
 
 
+def _shrink_image(image_bytes: bytes, max_dim: int) -> Tuple[bytes, str]:
+    """将截图等比缩放到最长边不超过 max_dim 并转为 JPEG，减小上传体积"""
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            img.thumbnail((max_dim, max_dim), Image.LANCZOS)
+            buf = io.BytesIO()
+            img.convert("RGB").save(buf, format="JPEG", quality=85)
+        return buf.getvalue(), "image/jpeg"
+    except Exception as e:
+        print(f"⚠️ 压缩截图失败，使用原图: {e}", file=sys.stderr)
+        return image_bytes, "image/png"
+
+
 def describe_screenshot(
     image_path: str,
     model_url: str,
@@ -413,9 +1013,20 @@ def describe_screenshot(
     timeout_s: int,
     max_tokens: int,
     temperature: float,
+    image_bytes: Optional[bytes] = None,
+    max_image_dim: int = 0,
 ) -> str:
-    with open(image_path, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode("ascii")
+    # 已有截图字节时直接编码，省去重新读取文件
+    if image_bytes is None:
+        with open(image_path, "rb") as f:
+            image_bytes = f.read()
+    # 视觉模型用不到原始分辨率；有 PIL 时缩小并转为 JPEG 再上传（坐标按相对值返回，不受缩放影响）
+    mime = "image/png"
+    if max_image_dim > 0 and PIL_AVAILABLE:
+        image_bytes, mime = _shrink_image(image_bytes, max_image_dim)
+    b64 = _b64.b64encode(image_bytes)
+    # 图片数据在发送时直接拼入请求体，payload 中只放占位符
+    placeholder = f"__PHONE_VIEW_IMAGE_{uuid.uuid4().hex}__"
 
     payload = {
         "model": model_name,
@@ -426,7 +1037,7 @@ def describe_screenshot(
                     {"type": "text", "text": prompt},
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{b64}"},
+                        "image_url": {"url": f"data:{mime};base64,{placeholder}"},
                     },
                 ],
             }
@@ -435,7 +1046,9 @@ def describe_screenshot(
         "temperature": temperature,
     }
 
-    data = _post_json(model_url.rstrip("/") + "/chat/completions", payload, timeout_s=timeout_s)
+    data = _post_json(
+        model_url.rstrip("/") + "/chat/completions", payload, timeout_s=timeout_s, splice=(placeholder, b64)
+    )
     try:
         return data["choices"][0]["message"]["content"]
     except Exception:
@@ -451,11 +1064,8 @@ DEFAULT_PROMPT = (
 )
 
 
-def create_relative_coordinate_prompt(base_prompt: str, screen_info: dict) -> str:
-    """创建使用相对坐标系统的增强prompt"""
-
-    return f"""
-{base_prompt}
+# 相对坐标增强 prompt 的固定部分，与 screen_info 无关，只构建一次
+_COORD_SUFFIX = """
 
 **额外任务：识别可点击元素并输出相对坐标信息**
 
@@ -515,66 +1125,19 @@ def create_relative_coordinate_prompt(base_prompt: str, screen_info: dict) -> st
 """
 
 
+def create_relative_coordinate_prompt(base_prompt: str, screen_info: dict) -> str:
+    """创建使用相对坐标系统的增强prompt"""
+    return f"\n{base_prompt}{_COORD_SUFFIX}"
+
+
 def create_enhanced_prompt(base_prompt: str, screen_info: dict) -> str:
     """创建包含坐标信息的增强prompt（保持向后兼容）"""
     return create_relative_coordinate_prompt(base_prompt, screen_info)
 
 
 def parse_coordinates_from_text(description: str) -> List[dict]:
-    """从文本描述中解析坐标信息（启发式方法）"""
-    elements = []
-
-    # 匹配坐标模式：(540, 300)
-    coord_pattern = r'🎯 坐标：\((\d+),\s*(\d+)\)'
-    # 匹配命令模式：python3 scripts/phone_control.py tap
-    command_pattern = r'💻 命令：([^📝\n]+)'
-    # 匹配元素描述：**搜索框**
-    element_pattern = r'\*\*(.+?)\*\*'
-    # 匹配优先级：(高优先级)
-    priority_pattern = r'\((高|中|低)优先级\)'
-
-    lines = description.split('\n')
-    current_element = {}
-
-    for line in lines:
-        # 查找元素标题行（数字开头，包含**）
-        if re.match(r'^\d+\.', line.strip()) and '**' in line:
-            # 保存前一个元素（如果有）
-            if current_element:
-                elements.append(current_element)
-
-            # 提取元素描述
-            element_match = re.search(r'\*\*(.+?)\*\*', line)
-            priority_match = re.search(priority_pattern, line)
-
-            current_element = {
-                'description': element_match.group(1) if element_match else line.strip(),
-                'type': 'unknown',
-                'priority': 'medium'
-            }
-
-            if priority_match:
-                priority_map = {'高': 'high', '中': 'medium', '低': 'low'}
-                current_element['priority'] = priority_map.get(priority_match.group(1), 'medium')
-
-        elif '🎯 坐标：' in line and current_element:
-            coord_match = re.search(coord_pattern, line)
-            if coord_match:
-                current_element['coordinates'] = {
-                    'x': int(coord_match.group(1)),
-                    'y': int(coord_match.group(2))
-                }
-
-        elif '💻 命令：' in line and current_element:
-            cmd_match = re.search(command_pattern, line)
-            if cmd_match:
-                current_element['command'] = cmd_match.group(1).strip()
-
-    # 添加最后一个元素
-    if current_element:
-        elements.append(current_element)
-
-    return elements
+    """从文本描述中解析坐标信息（启发式方法，只认绝对坐标，不做坐标换算）"""
+    return _parse_elements(description, relative=False)
 
 
 def save_coordinates_to_file(coords_data: dict, screen_info: dict, output_path: str) -> None:
@@ -589,6 +1152,127 @@ def save_coordinates_to_file(coords_data: dict, screen_info: dict, output_path:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
+def describe(
+    adb: str,
+    device: str,
+    timeout: int,
+    as_json: bool = False,
+    image_path: Optional[str] = None,
+    model_url: str = DEFAULT_MODEL_URL,
+    model_name: str = DEFAULT_MODEL_NAME,
+    prompt: str = DEFAULT_PROMPT,
+    focus: Optional[str] = None,
+    max_tokens: int = 800,
+    temperature: float = 0.2,
+    with_coords: bool = True,
+    coords_format: str = "text",
+    save_coords: bool = False,
+    include_base64: bool = False,
+    wm_query: Optional["Future[List[str]]"] = None,
+    image_bytes: Optional[bytes] = None,
+    max_image_dim: int = 1280,
+) -> Union[Dict[str, Any], str]:
+    """
+    截图（未提供 image_path 时）并调用视觉模型描述屏幕
+
+    供 `describe` 子命令和 phone_control.py 的 auto-view 进程内调用。
+    wm_query 为已在后台进行的 `_start_wm_query`；需要截图时，wm 查询与截图并行进行。
+    image_bytes 为 image_path 对应的 PNG 字节（可选），提供时不再重新读取文件。
+
+    Returns:
+        as_json=True 时返回与 `--json describe` 输出相同的字典，否则返回文本输出
+    """
+    # 密度只出现在 JSON 输出和保存的坐标文件里
+    need_density = as_json or save_coords
+    if image_path is None:
+        if with_coords and wm_query is None and _needs_wm_query(device, need_density):
+            wm_query = _start_wm_query(adb, device)
+        image_path, image_bytes = capture_screenshot(adb, device, timeout_s=timeout)
+
+    result: Dict[str, Any] = {
+        "ok": True,
+        "device": device,
+        "image_path": image_path,
+    }
+
+    # 获取屏幕信息（如果需要坐标）- 使用截图路径获取精确信息
+    screen_info = None
+    if with_coords:
+        try:
+            # 使用截图路径获取精确屏幕信息
+            wm_outputs = wm_query.result() if wm_query is not None else None
+            screen_info = get_accurate_screen_info(
+                adb, device, image_path, wm_outputs=wm_outputs, need_density=need_density
+            )
+            print(f"📱 屏幕尺寸：{screen_info['width']}x{screen_info['height']} (来源: {screen_info['source']})", file=sys.stderr)
+        except Exception as e:
+            print(f"⚠️ 无法获取屏幕信息，使用默认值：{e}", file=sys.stderr)
+            screen_info = {"width": 1080, "height": 2400, "density": 420, "source": "default"}
+
+    # 构建最终prompt
+    final_prompt = prompt
+
+    # 如果有focus参数，直接拼接到prompt后面
+    if focus:
+        final_prompt = f"{prompt}\n\n**特别关注：{focus}**"
+
+    # 生成智能prompt
+    if with_coords:
+        enhanced_prompt = create_enhanced_prompt(final_prompt, screen_info)
+        enhanced_max_tokens = max_tokens * 2  # 增加token限制
+    else:
+        enhanced_prompt = final_prompt
+        enhanced_max_tokens = max_tokens
+
+    desc = describe_screenshot(
+        image_path=image_path,
+        model_url=model_url,
+        model_name=model_name,
+        prompt=enhanced_prompt,
+        timeout_s=timeout,
+        max_tokens=enhanced_max_tokens,
+        temperature=temperature,
+        image_bytes=image_bytes,
+        max_image_dim=max_image_dim,
+    )
+
+    result["description"] = desc
+
+    if as_json:
+        if include_base64:
+            if image_bytes is None:
+                with open(image_path, "rb") as f:
+                    image_bytes = f.read()
+            result["image_base64"] = _b64.b64encode(image_bytes).decode("ascii")
+
+        # 如果包含坐标信息，添加额外数据
+        if with_coords:
+            result["screen_info"] = screen_info
+            # 使用新的相对坐标解析器
+            result["clickable_elements"] = parse_relative_coordinates_from_text(desc, screen_info)
+
+        return result
+
+    # 文本格式输出
+    output_text = desc
+    coords_data = parse_relative_coordinates_from_text(desc, screen_info) if with_coords else []
+
+    # 如果需要JSON格式的坐标信息
+    if with_coords and coords_format == "json":
+        if coords_data:
+            coord_json = json.dumps(coords_data, ensure_ascii=False, indent=2)
+            output_text += f"\n\n🎯 **坐标信息 (JSON格式)：**\n```json\n{coord_json}\n```"
+
+    # 保存坐标信息（可选）
+    if with_coords and save_coords:
+        if coords_data:
+            coords_file = f"screen_coords_{int(time.time())}.json"
+            save_coordinates_to_file({"elements": coords_data}, screen_info, coords_file)
+            print(f"💾 坐标信息已保存到：{coords_file}", file=sys.stderr)
+
+    return output_text
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         prog="phone_view.py",
@@ -600,6 +1284,7 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--output", default=None, help="Output screenshot path (.png). If omitted, a temp file is used.")
     p.add_argument("--json", action="store_true", help="Print machine-readable JSON output")
     p.add_argument("--base64", action="store_true", help="Include base64 image in JSON output")
+    p.add_argument("--wait", type=float, default=0, help="Seconds to wait before capturing the screen (default: 0)")
 
     sub = p.add_subparsers(dest="cmd", required=True)
 
@@ -612,6 +1297,8 @@ def build_parser() -> argparse.ArgumentParser:
     desc.add_argument("--focus", help="Focus point for analysis (added to prompt directly)")
     desc.add_argument("--max-tokens", type=int, default=800, help="Max tokens for the response")
     desc.add_argument("--temperature", type=float, default=0.2, help="Sampling temperature")
+    desc.add_argument("--max-image-dim", type=int, default=1280,
+                     help="Downscale the screenshot (JPEG) so its longest side fits before upload; needs PIL, 0 disables (default: 1280)")
 
     # 新增参数：坐标输出功能
     coords_group = desc.add_mutually_exclusive_group()
@@ -638,9 +1325,23 @@ def build_parser() -> argparse.ArgumentParser:
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
     args = build_parser().parse_args(argv)
+    # 本次运行中的 adb shell 命令共用一个常驻会话
+    with AdbShell(args.adb, args.device, timeout_s=args.timeout):
+        return _main(args)
+
+
+def _main(args: argparse.Namespace) -> int:
+    # 等待界面稳定后再截图（phone_control 的 auto-view 会传入 --wait）
+    if args.wait > 0:
+        time.sleep(args.wait)
+
+    # 屏幕尺寸/密度查询与截图互不依赖，放到后台与截图并行
+    wm_query = None
+    if args.cmd == "describe" and args.with_coords and _needs_wm_query(args.device, args.json or args.save_coords):
+        wm_query = _start_wm_query(args.adb, args.device)
 
     try:
-        path = capture_screenshot(args.adb, args.device, timeout_s=args.timeout, output_path=args.output)
+        path, image_bytes = capture_screenshot(args.adb, args.device, timeout_s=args.timeout, output_path=args.output)
     except Exception as e:
         print(str(e), file=sys.stderr)
         return 1
@@ -654,90 +1355,46 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     if args.cmd == "capture":
         if args.json:
             if args.base64:
-                with open(path, "rb") as f:
-                    result["image_base64"] = base64.b64encode(f.read()).decode("ascii")
-            print(json.dumps(result, ensure_ascii=False))
+                if image_bytes is None:
+                    with open(path, "rb") as f:
+                        image_bytes = f.read()
+                result["image_base64"] = _b64.b64encode(image_bytes).decode("ascii")
+            print(_dumps(result))
         else:
             print(path)
         return 0
 
     if args.cmd == "describe":
-        # 获取屏幕信息（如果需要坐标）- 使用截图路径获取精确信息
-        screen_info = None
-        if args.with_coords:
-            try:
-                # 使用截图路径获取精确屏幕信息
-                screen_info = get_accurate_screen_info(args.adb, args.device, path)
-                print(f"📱 屏幕尺寸：{screen_info['width']}x{screen_info['height']} (来源: {screen_info['source']})", file=sys.stderr)
-            except Exception as e:
-                print(f"⚠️ 无法获取屏幕信息，使用默认值：{e}", file=sys.stderr)
-                screen_info = {"width": 1080, "height": 2400, "density": 420, "source": "default"}
-
-        # 构建最终prompt
-        final_prompt = args.prompt
-
-        # 如果有focus参数，直接拼接到prompt后面
-        if hasattr(args, 'focus') and args.focus:
-            final_prompt = f"{args.prompt}\n\n**特别关注：{args.focus}**"
-
-        # 生成智能prompt
-        if args.with_coords:
-            enhanced_prompt = create_enhanced_prompt(final_prompt, screen_info)
-            enhanced_max_tokens = args.max_tokens * 2  # 增加token限制
-        else:
-            enhanced_prompt = final_prompt
-            enhanced_max_tokens = args.max_tokens
-
         try:
-            desc = describe_screenshot(
+            output = describe(
+                args.adb,
+                args.device,
+                args.timeout,
+                as_json=args.json,
                 image_path=path,
                 model_url=args.model_url,
                 model_name=args.model_name,
-                prompt=enhanced_prompt,
-                timeout_s=args.timeout,
-                max_tokens=enhanced_max_tokens,
+                prompt=args.prompt,
+                focus=args.focus,
+                max_tokens=args.max_tokens,
                 temperature=args.temperature,
+                with_coords=args.with_coords,
+                coords_format=args.coords_format,
+                save_coords=args.save_coords,
+                include_base64=args.base64,
+                wm_query=wm_query,
+                image_bytes=image_bytes,
+                max_image_dim=args.max_image_dim,
             )
         except Exception as e:
             print(str(e), file=sys.stderr)
             return 2
 
-        result["description"] = desc
-
         # 格式化输出
         if args.json:
-            if args.base64:
-                with open(path, "rb") as f:
-                    result["image_base64"] = base64.b64encode(f.read()).decode("ascii")
-
-            # 如果包含坐标信息，添加额外数据
-            if args.with_coords:
-                result["screen_info"] = screen_info
-                # 使用新的相对坐标解析器
-                result["clickable_elements"] = parse_relative_coordinates_from_text(desc, screen_info)
-
-            print(json.dumps(result, ensure_ascii=False, indent=2))
+            print(_dumps(output, indent=True))
         else:
-            # 文本格式输出
-            output_text = desc
-
-            # 如果需要JSON格式的坐标信息
-            if args.with_coords and args.coords_format == "json":
-                coords_data = parse_relative_coordinates_from_text(desc, screen_info)
-                if coords_data:
-                    coord_json = json.dumps(coords_data, ensure_ascii=False, indent=2)
-                    output_text += f"\n\n🎯 **坐标信息 (JSON格式)：**\n```json\n{coord_json}\n```"
-
-            print(output_text)
-
-            # 保存坐标信息（可选）
-            if args.with_coords and args.save_coords:
-                coords_data = parse_relative_coordinates_from_text(desc, screen_info)
-                if coords_data:
-                    coords_file = f"screen_coords_{int(time.time())}.json"
-                    save_coordinates_to_file({"elements": coords_data}, screen_info, coords_file)
-                    print(f"💾 坐标信息已保存到：{coords_file}", file=sys.stderr)
-
+            print(output)
         return 0
 
     print(f"Unknown command: {args.cmd}", file=sys.stderr)
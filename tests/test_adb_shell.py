@@ -0,0 +1,99 @@
+"""AdbShell 常驻会话测试：用 PATH 上的假 adb 代替真实设备"""
+
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from phone_view import AdbShell, _which  # noqa: E402
+
+# 假 adb：`adb -s DEV shell` 启动本地 sh 并记录一次会话，`adb -s DEV shell CMD` 直接执行
+FAKE_ADB = """#!/bin/sh
+shift 2
+shift
+if [ $# -eq 0 ]; then
+    echo spawn >> "$FAKE_ADB_LOG"
+    exec sh
+fi
+exec sh -c "$*"
+"""
+
+
+class AdbShellTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        tmp = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(tmp.cleanup)
+        cls.tmp = tmp.name
+        adb = os.path.join(cls.tmp, "adb")
+        with open(adb, "w") as f:
+            f.write(FAKE_ADB)
+        os.chmod(adb, os.stat(adb).st_mode | stat.S_IXUSR)
+        cls.log = os.path.join(cls.tmp, "spawn.log")
+        env = mock.patch.dict(
+            os.environ, {"PATH": cls.tmp + os.pathsep + os.environ["PATH"], "FAKE_ADB_LOG": cls.log}
+        )
+        env.start()
+        cls.addClassCleanup(env.stop)
+        # _which 按名字缓存可执行文件路径
+        _which.cache_clear()
+        cls.addClassCleanup(_which.cache_clear)
+
+    def setUp(self):
+        if os.path.exists(self.log):
+            os.unlink(self.log)
+        self.shell = AdbShell("adb", "fake", timeout_s=10)
+        self.addCleanup(self.shell.close)
+
+    def spawns(self) -> int:
+        if not os.path.exists(self.log):
+            return 0
+        with open(self.log) as f:
+            return len(f.read().split())
+
+    def test_exit_code_propagates(self):
+        res = self.shell.exec("exit 3")
+        self.assertFalse(res.ok)
+        self.assertEqual(res.returncode, 3)
+        self.assertTrue(self.shell.exec("true").ok)
+        self.assertEqual(self.spawns(), 1)
+
+    def test_stderr_kept_separate(self):
+        res = self.shell.exec("echo out; echo err >&2")
+        self.assertEqual(res.stdout, "out\n")
+        self.assertEqual(res.stderr, "err\n")
+
+    def test_output_without_trailing_newline(self):
+        res = self.shell.exec("printf abc; printf def >&2")
+        self.assertEqual((res.stdout, res.stderr, res.returncode), ("abc", "def", 0))
+
+    def test_quotes_and_comments_do_not_swallow_marker(self):
+        res = self.shell.exec("echo 'a b' # comment '")
+        self.assertEqual((res.stdout, res.returncode), ("a b\n", 0))
+
+    def test_timeout_kills_and_respawns_session(self):
+        res = self.shell.exec("echo started; sleep 3", timeout_s=1)
+        self.assertEqual(res.returncode, 124)
+        self.assertTrue(res.stderr.endswith("TIMEOUT"))
+        self.assertEqual(res.stdout, "started\n")
+
+        res = self.shell.exec("echo again")
+        self.assertEqual((res.stdout, res.returncode), ("again\n", 0))
+        self.assertEqual(self.spawns(), 2)
+
+    def test_deferred_cleanup_runs_on_exit(self):
+        marker = os.path.join(self.tmp, "cleaned")
+        self.addCleanup(lambda: os.path.exists(marker) and os.unlink(marker))
+        with self.shell as shell:
+            self.assertTrue(shell.exec("true").ok)
+            shell.defer(f"touch {marker}")
+            self.assertFalse(os.path.exists(marker))
+        self.assertTrue(os.path.exists(marker))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""描述文本解析测试：与原先逐行解析的实现逐项对比"""
+
+import os
+import random
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from phone_view import (  # noqa: E402
+    convert_absolute_to_relative,
+    convert_relative_to_absolute,
+    parse_coordinates_from_text,
+    parse_relative_coordinates_from_text,
+)
+
+SCREEN = {'width': 1080, 'height': 1920}
+
+
+def _reference_header(line):
+    element_match = re.search(r'\*\*(.+?)\*\*', line)
+    priority_match = re.search(r'\((高|中|低)优先级\)', line)
+    element = {
+        'description': element_match.group(1) if element_match else line.strip(),
+        'type': 'unknown',
+        'priority': 'medium',
+    }
+    if priority_match:
+        element['priority'] = {'高': 'high', '中': 'medium', '低': 'low'}[priority_match.group(1)]
+    return element
+
+
+def reference_parse_relative(description, screen_info):
+    """原先逐行实现的 parse_relative_coordinates_from_text，作为行为基准"""
+    elements = []
+    current = {}
+    for line in description.split('\n'):
+        if re.match(r'^\d+\.', line.strip()) and '**' in line:
+            if current:
+                elements.append(current)
+            current = _reference_header(line)
+        elif '🎯 相对坐标：' in line and current:
+            m = re.search(r'🎯 相对坐标：\((\d+),\s*(\d+)\)', line)
+            if m:
+                rel_x, rel_y = int(m.group(1)), int(m.group(2))
+                current['relative_coordinates'] = {'x': rel_x, 'y': rel_y}
+                abs_x, abs_y = convert_relative_to_absolute(rel_x, rel_y, screen_info['width'], screen_info['height'])
+                current['coordinates'] = {'x': abs_x, 'y': abs_y}
+        elif '🎯 坐标：' in line and current and 'coordinates' not in current:
+            m = re.search(r'🎯 坐标：\((\d+),\s*(\d+)\)', line)
+            if m:
+                abs_x, abs_y = int(m.group(1)), int(m.group(2))
+                rel_x, rel_y = convert_absolute_to_relative(abs_x, abs_y, screen_info['width'], screen_info['height'])
+                current['coordinates'] = {'x': abs_x, 'y': abs_y}
+                current['relative_coordinates'] = {'x': rel_x, 'y': rel_y}
+        elif '💻 命令：' in line and current:
+            m = re.search(r'💻 命令：([^📝\n]+)', line)
+            if m:
+                current['command'] = m.group(1).strip()
+    if current:
+        elements.append(current)
+    return elements
+
+
+def reference_parse_absolute(description):
+    """原先逐行实现的 parse_coordinates_from_text：只认绝对坐标，坐标与命令都以最后一处为准"""
+    elements = []
+    current = {}
+    for line in description.split('\n'):
+        if re.match(r'^\d+\.', line.strip()) and '**' in line:
+            if current:
+                elements.append(current)
+            current = _reference_header(line)
+        elif '🎯 坐标：' in line and current:
+            m = re.search(r'🎯 坐标：\((\d+),\s*(\d+)\)', line)
+            if m:
+                current['coordinates'] = {'x': int(m.group(1)), 'y': int(m.group(2))}
+        elif '💻 命令：' in line and current:
+            m = re.search(r'💻 命令：([^📝\n]+)', line)
+            if m:
+                current['command'] = m.group(1).strip()
+    if current:
+        elements.append(current)
+    return elements
+
+
+_TOKENS = [
+    '🎯 相对坐标：(%d, %d)', '🎯 坐标：(%d, %d)', '🎯 坐标：(%d,%d)', '🎯 相对坐标：(%d,\n%d)',
+    '💻 命令：cmd%d %d', '📝 说明：x', '🎯 相对坐标：(bad)', 'text', '**b**', '(高优先级)',
+]
+
+
+def random_description(rng: random.Random) -> str:
+    """随机拼出标题行与混合标记行，行尾随机为 LF 或 CRLF"""
+    lines = []
+    for _ in range(rng.randint(1, 12)):
+        if rng.random() < 0.25:
+            lines.append(
+                f"{rng.randint(1, 9)}. {rng.choice(['🔥', '⭐', ''])} **el{rng.randint(0, 99)}** "
+                f"{rng.choice(['(高优先级)', '(低优先级)', ''])}"
+            )
+            continue
+        parts = []
+        for _ in range(rng.randint(0, 3)):
+            token = rng.choice(_TOKENS)
+            parts.append(token % (rng.randint(0, 999), rng.randint(0, 999)) if '%d' in token else token)
+        lines.append('   ' * rng.randint(0, 1) + ' '.join(parts))
+    return ''.join(line + rng.choice(['\n', '\r\n']) for line in lines)
+
+
+class ParseRelativeTest(unittest.TestCase):
+    def assert_matches_reference(self, description):
+        self.assertEqual(
+            parse_relative_coordinates_from_text(description, SCREEN),
+            reference_parse_relative(description, SCREEN),
+            repr(description),
+        )
+
+    def test_crlf(self):
+        self.assert_matches_reference(
+            "1. **搜索框** (高优先级)\r\n   🎯 相对坐标：(500, 300)\r\n   💻 命令：tap 540 576\r\n"
+        )
+
+    def test_mixed_markers_on_one_line(self):
+        self.assert_matches_reference(
+            "1. **a**\n💻 命令：foo 🎯 坐标：(1, 2)\n🎯 坐标：(3, 4) 🎯 相对坐标：(5, 6)\n"
+            "2. **b**\n🎯 坐标：(7, 8) 💻 命令：bar\n🎯 坐标：(9, 10)\n💻 命令：baz 📝 说明：x\n"
+        )
+
+    def test_coordinates_split_across_lines(self):
+        self.assert_matches_reference("1. **a**\n🎯 相对坐标：(5,\n6)\n🎯 坐标：(7,\n8)\n")
+
+    def test_randomized_against_reference(self):
+        rng = random.Random(20240601)
+        for _ in range(3000):
+            self.assert_matches_reference(random_description(rng))
+
+
+class ParseAbsoluteTest(unittest.TestCase):
+    def assert_matches_reference(self, description):
+        self.assertEqual(
+            parse_coordinates_from_text(description), reference_parse_absolute(description), repr(description)
+        )
+
+    def test_last_coordinate_and_command_win(self):
+        self.assertEqual(
+            parse_coordinates_from_text("1. **a**\n🎯 坐标：(1, 2)\n💻 命令：foo\n🎯 坐标：(3, 4)\n💻 命令：bar\n"),
+            [{'description': 'a', 'type': 'unknown', 'priority': 'medium',
+              'coordinates': {'x': 3, 'y': 4}, 'command': 'bar'}],
+        )
+
+    def test_coordinate_marker_takes_the_line(self):
+        self.assertEqual(
+            parse_coordinates_from_text("1. **a**\n💻 命令：bar 🎯 坐标：(3,4)\n"),
+            [{'description': 'a', 'type': 'unknown', 'priority': 'medium', 'coordinates': {'x': 3, 'y': 4}}],
+        )
+
+    def test_relative_markers_ignored(self):
+        self.assert_matches_reference("1. **a**\n🎯 相对坐标：(5, 6)\n🎯 坐标：(3, 4) 🎯 相对坐标：(5, 6)\n")
+
+    def test_randomized_against_reference(self):
+        rng = random.Random(20240602)
+        for _ in range(3000):
+            self.assert_matches_reference(random_description(rng))
+
+
+if __name__ == "__main__":
+    unittest.main()